@@ -1,3 +1,8 @@
+import sys
+import time
+from array import array
+
+
 class Stack:
     def __init__(self):
         self.items = []
@@ -24,8 +29,238 @@ class Stack:
         return len(self.items)
 
 
+class TypedStack:
+    """Stack of machine numbers stored unboxed in an array.array.
+
+    Each value takes itemsize bytes (8 for the default "q" typecode) instead
+    of a pointer plus a boxed int object, and push_many()/pop_many() move
+    whole slices with a single memcpy.
+    """
+
+    def __init__(self, typecode="q", values=()):
+        self.items = array(typecode, values)
+
+    def push(self, item):
+        self.items.append(item)
+
+    def push_many(self, values):
+        """Push every value in order (last one ends up on top).
+
+        An array of the same typecode is copied in one block; any other
+        iterable of numbers is converted element by element.
+        """
+        if isinstance(values, array) and values.typecode == self.items.typecode:
+            self.items.extend(values)
+        else:
+            self.items.extend(array(self.items.typecode, values))
+
+    def pop(self):
+        if self.is_empty():
+            print("Stack is empty! Cannot pop.")
+            return None
+        return self.items.pop()
+
+    def pop_many(self, count):
+        """Pop up to count values; returned as an array in stack order (top last)."""
+        count = min(count, len(self.items))
+        if count <= 0:
+            return array(self.items.typecode)
+        top = self.items[-count:]
+        del self.items[-count:]
+        return top
+
+    def peek(self):
+        if self.is_empty():
+            print("Stack is empty! Nothing to peek.")
+            return None
+        return self.items[-1]
+
+    def view(self):
+        """Zero-copy memoryview of the contents, bottom to top.
+
+        The array cannot grow or shrink while a view exists, so release it
+        (view.release() or a with block) before the next push or pop.
+        """
+        return memoryview(self.items)
+
+    def is_empty(self):
+        return len(self.items) == 0
+
+    def __len__(self):
+        return len(self.items)
+
+
+class AggregateStack(Stack):
+    """Stack that also answers min, max and sum of its contents in O(1).
+
+    Every push records the running min, max and sum of everything at or
+    below it, in lists parallel to self.items; a pop drops those entries
+    with the value, so the answers stay correct without rescanning.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._mins = []
+        self._maxs = []
+        self._sums = []
+
+    def push(self, item):
+        if self._mins:
+            self._mins.append(item if item < self._mins[-1] else self._mins[-1])
+            self._maxs.append(item if item > self._maxs[-1] else self._maxs[-1])
+            self._sums.append(self._sums[-1] + item)
+        else:
+            self._mins.append(item)
+            self._maxs.append(item)
+            self._sums.append(item)
+        self.items.append(item)
+
+    def pop(self):
+        if self.is_empty():
+            print("Stack is empty! Cannot pop.")
+            return None
+        self._mins.pop()
+        self._maxs.pop()
+        self._sums.pop()
+        return self.items.pop()
+
+    def current_min(self):
+        if self.is_empty():
+            print("Stack is empty! No minimum.")
+            return None
+        return self._mins[-1]
+
+    def current_max(self):
+        if self.is_empty():
+            print("Stack is empty! No maximum.")
+            return None
+        return self._maxs[-1]
+
+    def current_sum(self):
+        return self._sums[-1] if self._sums else 0
+
+
+class AggregateQueue:
+    """FIFO queue built from two AggregateStacks, with O(1) min/max/sum.
+
+    Items are pushed onto the back stack; dequeue pops the front stack and,
+    when it is empty, first moves the whole back stack over (reversing it).
+    Each item is moved at most once, so dequeue is O(1) amortised, and the
+    aggregates of the queue combine those of the two stacks.
+    """
+
+    def __init__(self):
+        self._back = AggregateStack()
+        self._front = AggregateStack()
+
+    def enqueue(self, item):
+        self._back.push(item)
+
+    def dequeue(self):
+        if self.is_empty():
+            print("Queue is empty! Cannot dequeue.")
+            return None
+        if self._front.is_empty():
+            back, front = self._back, self._front
+            while not back.is_empty():
+                front.push(back.pop())
+        return self._front.pop()
+
+    def current_min(self):
+        if self.is_empty():
+            print("Queue is empty! No minimum.")
+            return None
+        if self._front.is_empty():
+            return self._back._mins[-1]
+        if self._back.is_empty():
+            return self._front._mins[-1]
+        return min(self._front._mins[-1], self._back._mins[-1])
+
+    def current_max(self):
+        if self.is_empty():
+            print("Queue is empty! No maximum.")
+            return None
+        if self._front.is_empty():
+            return self._back._maxs[-1]
+        if self._back.is_empty():
+            return self._front._maxs[-1]
+        return max(self._front._maxs[-1], self._back._maxs[-1])
+
+    def current_sum(self):
+        return self._front.current_sum() + self._back.current_sum()
+
+    def is_empty(self):
+        return len(self) == 0
+
+    def __len__(self):
+        return len(self._front) + len(self._back)
+
+
+def sliding_window_min_max(values, k):
+    """Yield (min, max) of every window of k consecutive values, O(1) amortised each."""
+    if k <= 0:
+        raise ValueError("window size must be positive")
+    window = AggregateQueue()
+    for value in values:
+        window.enqueue(value)
+        if len(window) > k:
+            window.dequeue()
+        if len(window) == k:
+            yield window.current_min(), window.current_max()
+
+
+def _run_benchmark(n=10**6):
+    """Memory held by n ints in Stack vs TypedStack, and push/pop timing."""
+    import tracemalloc
+
+    for label, make in (("Stack (list)", Stack), ("TypedStack('q')", TypedStack)):
+        tracemalloc.start()
+        stack = make()
+        start = time.perf_counter()
+        for value in range(10**9, 10**9 + n):  # large enough to avoid the small-int cache
+            stack.push(value)
+        push_time = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        start = time.perf_counter()
+        while len(stack):
+            stack.pop()
+        pop_time = time.perf_counter() - start
+        print(
+            f"{label:<16} {current / n:6.1f} B/item (peak {peak / 2**20:6.1f} MiB)  "
+            f"push {push_time / n * 1e9:4.0f} ns  pop {pop_time / n * 1e9:4.0f} ns"
+        )
+
+    stack = TypedStack()
+    block = array("q", range(n))
+    start = time.perf_counter()
+    for _ in range(100):
+        stack.push_many(block)
+        stack.pop_many(n)
+    elapsed = time.perf_counter() - start
+    print(f"push_many + pop_many of {n:,} values: {elapsed / 100 * 1e3:.2f} ms per round trip")
+
+    # Sliding-window min/max: two-stack queue vs rescanning each window
+    import random
+
+    values = [random.random() for _ in range(10**5)]
+    for k in (10, 1000):
+        start = time.perf_counter()
+        fast = list(sliding_window_min_max(values, k))
+        fast_time = time.perf_counter() - start
+        start = time.perf_counter()
+        slow = [(min(values[i:i + k]), max(values[i:i + k])) for i in range(len(values) - k + 1)]
+        slow_time = time.perf_counter() - start
+        assert fast == slow
+        print(f"sliding window k={k:<5} AggregateQueue {fast_time:6.3f} s  rescan {slow_time:6.3f} s")
+
+
 # Interactive menu
 if __name__ == "__main__":
+    if "--bench" in sys.argv[1:]:
+        _run_benchmark()
+        sys.exit(0)
+
     stack = Stack()
 
     while True:
@@ -1,21 +1,56 @@
+from collections import deque
+from itertools import islice
+
+
 class Queue:
-    def __init__(self):
-        self.items = []
+    """FIFO queue backed by collections.deque (O(1) enqueue and dequeue)."""
+
+    def __init__(self, capacity=None):
+        if capacity is not None and capacity <= 0:
+            raise ValueError("capacity must be a positive integer or None")
+        self.capacity = capacity
+        self.items = deque()
 
     def enqueue(self, item):
+        if self.is_full():
+            print("Queue is full! Cannot enqueue.")
+            return
         self.items.append(item)
 
+    def enqueue_many(self, items):
+        """Enqueue items in order until the queue is full; return how many fit."""
+        before = len(self.items)
+        if self.capacity is None:
+            self.items.extend(items)
+        else:
+            self.items.extend(islice(items, self.capacity - before))
+        return len(self.items) - before
+
     def dequeue(self):
         if self.is_empty():
             print("Queue is empty! Cannot dequeue.")
             return None
-        return self.items.pop(0)
+        return self.items.popleft()
+
+    def dequeue_many(self, count):
+        """Dequeue up to count items and return them as a list (oldest first)."""
+        popleft = self.items.popleft
+        return [popleft() for _ in range(min(count, len(self.items)))]
 
     def is_empty(self):
         return len(self.items) == 0
 
+    def is_full(self):
+        return self.capacity is not None and len(self.items) >= self.capacity
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
     def __str__(self):
-        return "Queue: " + str(self.items)
+        return "Queue: " + str(list(self.items))
 
 
 # Interactive part
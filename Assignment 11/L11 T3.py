@@ -1,37 +1,161 @@
+import sys
+import time
+from collections import deque
+
+
 class Node:
+    __slots__ = ("data", "next")  # no per-node __dict__
+
     def __init__(self, data):
         self.data = data
         self.next = None
 
 
 class SinglyLinkedList:
-    def __init__(self):
+    """Singly linked list with a tail pointer and a length counter,
+    so appends and len() are O(1).
+
+    With indexed=True (or after build_index()) the list also keeps a hash
+    index that makes delete_node(), `in` and count() O(1) on average:
+        _index: value -> its node, or a deque of its nodes in list order
+                when the value occurs more than once
+        _prev:  node -> predecessor node (None for the head)
+    Deleting the first occurrence pops the front of its entry and unlinks it
+    through its predecessor, so no scan is needed. Values must be hashable.
+    The price is two dict entries per node plus a deque per repeated value:
+    about 84 bytes per node for distinct ints on CPython 3.11, slightly more
+    than the 80 bytes of the node and its int (see --bench).
+    """
+
+    def __init__(self, iterable=(), indexed=False):
         self.head = None
+        self.tail = None
+        self._size = 0
+        self._index = None
+        self._prev = None
+        self.extend(iterable)
+        if indexed:
+            self.build_index()
+
+    # ---- value index ------------------------------------------------------
+
+    @property
+    def indexed(self):
+        return self._index is not None
+
+    def build_index(self):
+        """Index every node by value; O(n) time, kept up to date afterwards."""
+        self._index = {}
+        self._prev = {}
+        self._index_chain(None, self.head)
+
+    def drop_index(self):
+        """Discard the index and fall back to linear scans."""
+        self._index = None
+        self._prev = None
+
+    def _index_chain(self, prev, node):
+        """Add node and everything after it to the index (appended in order)."""
+        index, prev_of = self._index, self._prev
+        while node is not None:
+            prev_of[node] = prev
+            entry = index.get(node.data)
+            if entry is None:
+                index[node.data] = node
+            elif type(entry) is deque:
+                entry.append(node)
+            else:
+                index[node.data] = deque((entry, node))
+            prev = node
+            node = node.next
+
+    def _index_prepend(self, node):
+        prev_of = self._prev
+        if node.next is not None:
+            prev_of[node.next] = node
+        prev_of[node] = None
+        entry = self._index.get(node.data)
+        if entry is None:
+            self._index[node.data] = node
+        elif type(entry) is deque:
+            entry.appendleft(node)
+        else:
+            self._index[node.data] = deque((node, entry))
+
+    def _index_first(self, key):
+        entry = self._index.get(key)
+        if type(entry) is deque:
+            return entry[0]
+        return entry
+
+    def _index_remove_first(self, node):
+        key = node.data
+        entry = self._index[key]
+        if type(entry) is deque:
+            entry.popleft()
+            if len(entry) == 1:
+                self._index[key] = entry[0]
+        else:
+            del self._index[key]
+        prev = self._prev.pop(node)
+        if node.next is not None:
+            self._prev[node.next] = prev
+        return prev
 
     def insert_at_beginning(self, data):
         """Insert a new node at the beginning of the list."""
         new_node = Node(data)
         new_node.next = self.head
         self.head = new_node
+        if self.tail is None:
+            self.tail = new_node
+        self._size += 1
+        if self._index is not None:
+            self._index_prepend(new_node)
 
     def insert_at_end(self, data):
         """Insert a new node at the end of the list."""
         new_node = Node(data)
-        if self.head is None:
+        if self.tail is None:
             self.head = new_node
-            return
-        temp = self.head
-        while temp.next:
-            temp = temp.next
-        temp.next = new_node
+        else:
+            self.tail.next = new_node
+        if self._index is not None:
+            self._index_chain(self.tail, new_node)
+        self.tail = new_node
+        self._size += 1
+
+    def extend(self, iterable):
+        """Append every value of iterable, in order, in one pass."""
+        old_tail = tail = self.tail
+        added = 0
+        for data in iterable:
+            node = Node(data)
+            if tail is None:
+                self.head = node
+            else:
+                tail.next = node
+            tail = node
+            added += 1
+        self.tail = tail
+        self._size += added
+        if self._index is not None and added:
+            self._index_chain(old_tail, old_tail.next if old_tail else self.head)
 
     def delete_node(self, key):
         """Delete the first occurrence of a node with given data."""
+        if self._index is not None:
+            self._delete_indexed(key)
+            return
+
         temp = self.head
 
         # If head node itself holds the key
         if temp is not None and temp.data == key:
             self.head = temp.next
+            if self.head is None:
+                self.tail = None
+            self._size -= 1
             temp = None
             return
 
@@ -48,8 +172,140 @@ class SinglyLinkedList:
 
         # Unlink the node
         prev.next = temp.next
+        if temp is self.tail:
+            self.tail = prev
+        self._size -= 1
         temp = None
 
+    def _delete_indexed(self, key):
+        node = self._index_first(key)
+        if node is None:
+            print(f"Value {key} not found in list.")
+            return
+        prev = self._index_remove_first(node)
+        if prev is None:
+            self.head = node.next
+        else:
+            prev.next = node.next
+        if node is self.tail:
+            self.tail = prev
+        self._size -= 1
+
+    # ---- sorted-list operations ---------------------------------------------
+
+    @staticmethod
+    def _split_after(node, count):
+        """Cut the chain after `count` nodes; return the head of the rest."""
+        for _ in range(count - 1):
+            if node is None:
+                return None
+            node = node.next
+        if node is None:
+            return None
+        rest = node.next
+        node.next = None
+        return rest
+
+    @staticmethod
+    def _merge(tail, left, right):
+        """Link the sorted chains left and right after `tail`, stably;
+        return the last node of the merged chain."""
+        while left is not None and right is not None:
+            if right.data < left.data:
+                tail.next = right
+                tail = right
+                right = right.next
+            else:
+                tail.next = left
+                tail = left
+                left = left.next
+        rest = left if left is not None else right
+        tail.next = rest
+        while rest is not None:
+            tail = rest
+            rest = rest.next
+        return tail
+
+    def sort(self):
+        """Sort the nodes in place (stable bottom-up merge sort).
+
+        Runs of width 1, 2, 4, ... are merged by relinking nodes, so there
+        is no recursion and only one extra sentinel node: O(n log n) time,
+        O(1) extra memory. An index, if present, is rebuilt afterwards.
+        """
+        if self._size < 2:
+            return
+        sentinel = Node(None)
+        sentinel.next = self.head
+        width = 1
+        while width < self._size:
+            tail = sentinel
+            current = sentinel.next
+            while current is not None:
+                left = current
+                right = self._split_after(left, width)
+                current = self._split_after(right, width)
+                tail = self._merge(tail, left, right)
+            width *= 2
+        self.head = sentinel.next
+        self.tail = tail
+        if self._index is not None:
+            self.build_index()
+
+    def merge_sorted(self, other):
+        """Splice the nodes of another sorted list into this sorted list.
+
+        O(len(self) + len(other)) and stable (on ties, this list's nodes come
+        first). `other` is left empty.
+        """
+        if other is self:
+            raise ValueError("cannot merge a list with itself")
+        if other.head is None:
+            return
+        sentinel = Node(None)
+        self.tail = self._merge(sentinel, self.head, other.head)
+        self.head = sentinel.next
+        self._size += other._size
+        other.head = other.tail = None
+        other._size = 0
+        if other._index is not None:
+            other.build_index()
+        if self._index is not None:
+            self.build_index()
+
+    def dedupe_sorted(self):
+        """Unlink repeated values from a sorted list, keeping the first of
+        each run; return how many nodes were removed."""
+        node = self.head
+        removed = 0
+        while node is not None:
+            following = node.next
+            while following is not None and following.data == node.data:
+                following = following.next
+                removed += 1
+            node.next = following
+            if following is None:
+                self.tail = node
+            node = following
+        self._size -= removed
+        if removed and self._index is not None:
+            self.build_index()
+        return removed
+
+    def count(self, value):
+        """Number of nodes holding value (O(1) average when indexed)."""
+        if self._index is not None:
+            entry = self._index.get(value)
+            if entry is None:
+                return 0
+            return len(entry) if type(entry) is deque else 1
+        return sum(1 for data in self if data == value)
+
+    def __contains__(self, value):
+        if self._index is not None:
+            return value in self._index
+        return any(data == value for data in self)
+
     def display(self):
         """Display the linked list."""
         if self.head is None:
@@ -61,9 +317,122 @@ class SinglyLinkedList:
             temp = temp.next
         print("None")
 
+    def __iter__(self):
+        temp = self.head
+        while temp:
+            yield temp.data
+            temp = temp.next
+
+    def __len__(self):
+        return self._size
+
+
+def _run_benchmark(n=10**6):
+    """Bulk construction time and memory, against the original list layout."""
+    import tracemalloc
+
+    class DictNode:  # the original Node, with a per-instance __dict__
+        def __init__(self, data):
+            self.data = data
+            self.next = None
+
+    def walk_append(head, data):  # the original insert_at_end
+        new_node = DictNode(data)
+        if head is None:
+            return new_node
+        temp = head
+        while temp.next:
+            temp = temp.next
+        temp.next = new_node
+        return head
+
+    for count in (1000, 4000):
+        head = None
+        start = time.perf_counter()
+        for value in range(count):
+            head = walk_append(head, value)
+        print(f"{f'original insert_at_end x {count:,}':<36}{time.perf_counter() - start:7.3f} s")
+
+    for count in (n // 10, n):
+        sll = SinglyLinkedList()
+        start = time.perf_counter()
+        for value in range(count):
+            sll.insert_at_end(value)
+        print(f"{f'insert_at_end x {count:,}':<36}{time.perf_counter() - start:7.3f} s")
+        start = time.perf_counter()
+        sll = SinglyLinkedList(range(count))
+        print(f"{f'extend({count:,})':<36}{time.perf_counter() - start:7.3f} s")
+    del sll
+
+    values = range(10**9, 10**9 + n)  # the same int objects are not shared
+    for label, make in (("__dict__ nodes", DictNode), ("__slots__ nodes", Node)):
+        tracemalloc.start()
+        head = None
+        for value in values:
+            node = make(value)
+            node.next = head
+            head = node
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del head, node
+        print(f"{label:<36}{current / n:7.1f} B/node")
+
+    # Value index: memory overhead and delete-by-key throughput
+    sll = SinglyLinkedList(values)
+    tracemalloc.start()
+    sll.build_index()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{'value index overhead':<36}{current / n:7.1f} B/node")
+    middle = 10**9 + n // 2  # keys from the middle of the list
+    for label, indexed, deletes in (("scan", False, 200), ("indexed", True, 20_000)):
+        sll = SinglyLinkedList(values, indexed=indexed)
+        start = time.perf_counter()
+        for key in range(middle, middle + deletes):
+            sll.delete_node(key)
+        elapsed = time.perf_counter() - start
+        print(f"{f'delete_node ({label})':<36}{elapsed / deletes * 1e6:7.1f} us each")
+
+    # In-place sort / merge / dedupe vs round-tripping through a Python list
+    import random
+
+    rng = random.Random(5)
+    data = [rng.randrange(n) for _ in range(n)]
+    sll = SinglyLinkedList(data)
+    start = time.perf_counter()
+    sll.sort()
+    print(f"{f'sort() in place, {n:,} nodes':<36}{time.perf_counter() - start:7.3f} s")
+    sll = SinglyLinkedList(data)
+    start = time.perf_counter()
+    sll = SinglyLinkedList(sorted(sll))
+    print(f"{'list round trip (sorted + rebuild)':<36}{time.perf_counter() - start:7.3f} s")
+
+    in_place, odds = SinglyLinkedList(range(0, n, 2)), SinglyLinkedList(range(1, n, 2))
+    start = time.perf_counter()
+    in_place.merge_sorted(odds)
+    print(f"{'merge_sorted() in place':<36}{time.perf_counter() - start:7.3f} s")
+    evens, odds = SinglyLinkedList(range(0, n, 2)), SinglyLinkedList(range(1, n, 2))
+    start = time.perf_counter()
+    merged = SinglyLinkedList(sorted(list(evens) + list(odds)))
+    print(f"{'list round trip (merge)':<36}{time.perf_counter() - start:7.3f} s")
+    assert list(in_place) == list(merged)
+
+    start = time.perf_counter()
+    removed = sll.dedupe_sorted()
+    print(f"{f'dedupe_sorted() ({removed:,} removed)':<36}{time.perf_counter() - start:7.3f} s")
+    sll = SinglyLinkedList(sorted(data))
+    start = time.perf_counter()
+    sll = SinglyLinkedList(sorted(set(sll)))
+    print(f"{'list round trip (dedupe)':<36}{time.perf_counter() - start:7.3f} s")
+
 
 # Interactive menu
 if __name__ == "__main__":
+    if "--bench" in sys.argv[1:]:
+        args = sys.argv[sys.argv.index("--bench") + 1:]
+        _run_benchmark(int(float(args[0])) if args else 10**6)
+        sys.exit(0)
+
     sll = SinglyLinkedList()
 
     while True:
@@ -1,11 +1,29 @@
-def factorial(n):
-    """Calculate the factorial of a number using recursion."""
+import os
+import sys
+
+try:
+    from factorial_engine import factorial as _engine_factorial
+except ImportError:
+    # Running from inside Assignment 18/: make the repository root importable.
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from factorial_engine import factorial as _engine_factorial
+
+
+def factorial(n, method="split"):
+    """Calculate the factorial of a number.
+
+    method is one of the factorial_engine methods ("split", "swing",
+    "parallel", "loop"), or None for the plain n * (n-1)! recursion, which
+    the recursion limit caps at n below ~1000.
+    """
     if n < 0:
         return "Error: Factorial not defined for negative numbers"
+    if method is not None:
+        return _engine_factorial(n, method)
     elif n == 0 or n == 1:
         return 1
     else:
-        return n * factorial(n - 1)
+        return n * factorial(n - 1, method=None)
 
 
 # Test with different inputs
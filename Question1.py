@@ -1,14 +1,62 @@
+from typing import Iterator, Optional
+
+from bigint_format import to_decimal
+from lab5.fib_recursive import fib_pair
+
+
+class FibonacciStream:
+    """Lazily yield F(start), F(start + 1), ... up to (but excluding) F(stop).
+
+    Only the current pair of values is kept, so memory stays constant no
+    matter how many terms are consumed. The stream is seeded with fast
+    doubling, so starting at a large index costs O(log start) multiplications
+    instead of walking from 0. `index` always holds the index of the next
+    value, which makes a stream resumable: FibonacciStream(start=s.index).
+    """
+
+    def __init__(self, start: int = 0, stop: Optional[int] = None):
+        if start < 0:
+            raise ValueError("start must be a non-negative integer")
+        self.index = start
+        self.stop = stop
+        self._current, self._next = fib_pair(start)
+
+    def __iter__(self) -> "FibonacciStream":
+        return self
+
+    def __next__(self) -> int:
+        if self.stop is not None and self.index >= self.stop:
+            raise StopIteration
+        value = self._current
+        self._current, self._next = self._next, self._current + self._next
+        self.index += 1
+        return value
+
+    def chunks(self, size: int) -> Iterator[list[int]]:
+        """Yield the remaining values as lists of at most `size` items."""
+        if size <= 0:
+            raise ValueError("size must be a positive integer")
+        while True:
+            chunk = []
+            for value in self:
+                chunk.append(value)
+                if len(chunk) == size:
+                    break
+            if not chunk:
+                return
+            yield chunk
+
+
+def iter_fibonacci(n: int, start: int = 0) -> Iterator[int]:
+    """Lazily yield n Fibonacci numbers beginning at index `start`."""
+    return FibonacciStream(start, start + max(n, 0))
+
+
 def generate_fibonacci(n: int) -> list[int]:
     """Return the first n Fibonacci numbers."""
     if n <= 0:
         return []
-    if n == 1:
-        return [0]
-
-    sequence = [0, 1]
-    while len(sequence) < n:
-        sequence.append(sequence[-1] + sequence[-2])
-    return sequence
+    return list(iter_fibonacci(n))
 
 
 def prompt_positive_integer(message: str) -> int:
@@ -26,8 +74,13 @@ def prompt_positive_integer(message: str) -> int:
 def main() -> None:
     n = prompt_positive_integer("Enter how many Fibonacci numbers to print: ")
 
-    sequence = generate_fibonacci(n)
-    print("Fibonacci sequence:", sequence)
+    # Streamed in chunks, but printed exactly as print(list) would.
+    print("Fibonacci sequence: [", end="")
+    separator = ""
+    for chunk in FibonacciStream(0, n).chunks(1000):
+        print(separator + ", ".join(map(to_decimal, chunk)), end="")
+        separator = ", "
+    print("]")
 
 
 if __name__ == "__main__":
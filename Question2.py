@@ -1,14 +1,45 @@
+import sys
+import time
+from collections import deque
+from itertools import islice
+
+
 class Queue:
-    def __init__(self):
-        self.items = []
+    """FIFO queue backed by collections.deque, so both ends are O(1).
+
+    An optional capacity bounds the queue; enqueue on a full queue is
+    refused with a message, the same way dequeue on an empty one is.
+    """
+
+    def __init__(self, capacity=None):
+        if capacity is not None and capacity <= 0:
+            raise ValueError("capacity must be a positive integer or None")
+        self.capacity = capacity
+        self.items = deque()
 
     def enqueue(self, item):
+        if self.is_full():
+            return "Queue is full. Cannot enqueue."
         self.items.append(item)
 
+    def enqueue_many(self, items):
+        """Enqueue items in order until the queue is full; return how many fit."""
+        before = len(self.items)
+        if self.capacity is None:
+            self.items.extend(items)
+        else:
+            self.items.extend(islice(items, self.capacity - before))
+        return len(self.items) - before
+
     def dequeue(self):
         if self.is_empty():
             return "Queue is empty. Cannot dequeue."
-        return self.items.pop(0)
+        return self.items.popleft()
+
+    def dequeue_many(self, count):
+        """Dequeue up to count items and return them as a list (oldest first)."""
+        popleft = self.items.popleft
+        return [popleft() for _ in range(min(count, len(self.items)))]
 
     def peek(self):
         if self.is_empty():
@@ -18,43 +49,77 @@ class Queue:
     def is_empty(self):
         return len(self.items) == 0
 
+    def is_full(self):
+        return self.capacity is not None and len(self.items) >= self.capacity
+
     def size(self):
         return len(self.items)
 
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        """Iterate from front to back without removing anything."""
+        return iter(self.items)
+
+
+def _run_benchmark(n=10**7):
+    """Fill and drain n items; time grows linearly with n."""
+    for count in (n // 100, n // 10, n):
+        q = Queue()
+        start = time.perf_counter()
+        q.enqueue_many(iter(range(count)))
+        while q.size():
+            q.dequeue()
+        elapsed = time.perf_counter() - start
+        print(f"enqueue + drain {count:>10,} items: {elapsed:7.3f} s ({elapsed / count * 1e9:.0f} ns/item)")
+
+    # The previous list.pop(0) queue, for comparison, at a size it can finish
+    items = list(range(n // 100))
+    start = time.perf_counter()
+    while items:
+        items.pop(0)
+    print(f"list.pop(0) drain {n // 100:>8,} items: {time.perf_counter() - start:7.3f} s")
+
 
 # -----------------------
 # USER INPUT MENU SYSTEM
 # -----------------------
 
-q = Queue()
+if __name__ == "__main__":
+    if "--bench" in sys.argv[1:]:
+        _run_benchmark()
+        sys.exit(0)
+
+    q = Queue()
 
-while True:
-    print("\n---- Queue Operations ----")
-    print("1. Enqueue")
-    print("2. Dequeue")
-    print("3. Peek")
-    print("4. Size")
-    print("5. Exit")
+    while True:
+        print("\n---- Queue Operations ----")
+        print("1. Enqueue")
+        print("2. Dequeue")
+        print("3. Peek")
+        print("4. Size")
+        print("5. Exit")
 
-    choice = input("Enter your choice (1-5): ")
+        choice = input("Enter your choice (1-5): ")
 
-    if choice == "1":
-        value = input("Enter value to enqueue: ")
-        q.enqueue(value)
-        print("Enqueued:", value)
+        if choice == "1":
+            value = input("Enter value to enqueue: ")
+            q.enqueue(value)
+            print("Enqueued:", value)
 
-    elif choice == "2":
-        print("Dequeue result:", q.dequeue())
+        elif choice == "2":
+            print("Dequeue result:", q.dequeue())
 
-    elif choice == "3":
-        print("Peek:", q.peek())
+        elif choice == "3":
+            print("Peek:", q.peek())
 
-    elif choice == "4":
-        print("Queue size:", q.size())
+        elif choice == "4":
+            print("Queue size:", q.size())
 
-    elif choice == "5":
-        print("Exiting program...")
-        break
+        elif choice == "5":
+            print("Exiting program...")
+            break
 
-    else:
-        print("Invalid choice. Please select between 1-5.")
+        else:
+            print("Invalid choice. Please select between 1-5.")
@@ -0,0 +1,310 @@
+"""
+blocking_queue.py
+Thread-safe and asyncio variants of the Question2 Queue for producer/consumer pipelines.
+
+BlockingQueue guards the deque with one lock and two conditions (not empty,
+not full): put() blocks while a bounded queue is full (backpressure) and get()
+blocks while it is empty, both with optional timeouts. put_many()/get_many()
+move a whole batch per lock acquisition, which is what makes hand-off cheap
+when items are small.
+
+AsyncQueue is the same surface for coroutines, built on asyncio.Condition.
+
+Usage:
+    q = BlockingQueue(capacity=10_000)
+    q.put(item); q.put_many(batch, timeout=1.0)
+    item = q.get(timeout=0.5); batch = q.get_many(256)
+
+    python blocking_queue.py --bench   # multi-producer/multi-consumer throughput
+"""
+import asyncio
+import queue
+import threading
+import time
+from typing import Any, Iterable, List, Optional
+
+from Question2 import Queue
+
+
+class BlockingQueue(Queue):
+    """Bounded or unbounded FIFO queue that is safe to share between threads.
+
+    enqueue()/dequeue() block like put()/get(); peek(), size(), is_empty()
+    and is_full() keep the Question2 behaviour and are read under the lock.
+    Timeouts raise queue.Full / queue.Empty, as the standard library does.
+    """
+
+    def __init__(self, capacity: Optional[int] = None):
+        super().__init__(capacity)
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def _room(self) -> int:
+        if self.capacity is None:
+            return -1
+        return self.capacity - len(self.items)
+
+    def put(self, item: Any, timeout: Optional[float] = None) -> None:
+        """Append item, waiting up to `timeout` seconds for free space."""
+        with self._not_full:
+            if not self._not_full.wait_for(lambda: self._room() != 0, timeout):
+                raise queue.Full
+            self.items.append(item)
+            self._not_empty.notify()
+
+    def put_many(self, items: Iterable[Any], timeout: Optional[float] = None) -> None:
+        """Append all items in order, taking the lock once per batch that fits.
+
+        On a bounded queue the batch is split across waits for free space.
+        If `timeout` expires first, queue.Full is raised and the items
+        already placed stay in the queue.
+        """
+        pending = list(items)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        start = 0
+        with self._not_full:
+            while start < len(pending):
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                if not self._not_full.wait_for(lambda: self._room() != 0, remaining):
+                    raise queue.Full
+                room = self._room()
+                end = len(pending) if room < 0 else min(len(pending), start + room)
+                self.items.extend(pending[start:end])
+                self._not_empty.notify(end - start)
+                start = end
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """Remove and return the oldest item, waiting up to `timeout` seconds."""
+        with self._not_empty:
+            if not self._not_empty.wait_for(lambda: self.items, timeout):
+                raise queue.Empty
+            item = self.items.popleft()
+            self._not_full.notify()
+            return item
+
+    def get_many(self, max_items: int, timeout: Optional[float] = None) -> List[Any]:
+        """Wait for at least one item, then remove up to max_items at once."""
+        with self._not_empty:
+            if not self._not_empty.wait_for(lambda: self.items, timeout):
+                raise queue.Empty
+            popleft = self.items.popleft
+            batch = [popleft() for _ in range(min(max_items, len(self.items)))]
+            self._not_full.notify(len(batch))
+            return batch
+
+    def enqueue(self, item):
+        self.put(item)
+
+    def dequeue(self):
+        return self.get()
+
+    def enqueue_many(self, items):
+        """Non-blocking: enqueue items until the queue is full; return how many fit."""
+        with self._lock:
+            added = super().enqueue_many(items)
+            self._not_empty.notify(added)
+            return added
+
+    def dequeue_many(self, count):
+        """Non-blocking: remove and return up to count items."""
+        with self._lock:
+            batch = super().dequeue_many(count)
+            self._not_full.notify(len(batch))
+            return batch
+
+    def peek(self):
+        with self._lock:
+            if not self.items:
+                return "Queue is empty. Nothing to peek."
+            return self.items[0]
+
+    def is_empty(self):
+        with self._lock:
+            return len(self.items) == 0
+
+    def is_full(self):
+        with self._lock:
+            return self._room() == 0
+
+    def size(self):
+        with self._lock:
+            return len(self.items)
+
+    def __iter__(self):
+        """Iterate over a snapshot, since other threads may be mutating."""
+        with self._lock:
+            return iter(list(self.items))
+
+
+class AsyncQueue(Queue):
+    """asyncio twin of BlockingQueue: the blocking calls are coroutines.
+
+    enqueue()/dequeue() and enqueue_many()/dequeue_many() are coroutines
+    too, so every change to the items wakes waiting coroutines. Timeouts
+    raise asyncio.QueueFull / asyncio.QueueEmpty.
+    """
+
+    def __init__(self, capacity: Optional[int] = None):
+        super().__init__(capacity)
+        self._changed = asyncio.Condition()
+
+    def _room(self) -> int:
+        if self.capacity is None:
+            return -1
+        return self.capacity - len(self.items)
+
+    async def _wait(self, predicate, timeout: Optional[float]) -> bool:
+        try:
+            await asyncio.wait_for(self._changed.wait_for(predicate), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def put(self, item: Any, timeout: Optional[float] = None) -> None:
+        async with self._changed:
+            if not await self._wait(lambda: self._room() != 0, timeout):
+                raise asyncio.QueueFull
+            self.items.append(item)
+            self._changed.notify_all()
+
+    async def put_many(self, items: Iterable[Any], timeout: Optional[float] = None) -> None:
+        pending = list(items)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        start = 0
+        async with self._changed:
+            while start < len(pending):
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                if not await self._wait(lambda: self._room() != 0, remaining):
+                    raise asyncio.QueueFull
+                room = self._room()
+                end = len(pending) if room < 0 else min(len(pending), start + room)
+                self.items.extend(pending[start:end])
+                start = end
+                self._changed.notify_all()
+
+    async def get(self, timeout: Optional[float] = None) -> Any:
+        async with self._changed:
+            if not await self._wait(lambda: self.items, timeout):
+                raise asyncio.QueueEmpty
+            item = self.items.popleft()
+            self._changed.notify_all()
+            return item
+
+    async def get_many(self, max_items: int, timeout: Optional[float] = None) -> List[Any]:
+        async with self._changed:
+            if not await self._wait(lambda: self.items, timeout):
+                raise asyncio.QueueEmpty
+            popleft = self.items.popleft
+            batch = [popleft() for _ in range(min(max_items, len(self.items)))]
+            self._changed.notify_all()
+            return batch
+
+    async def enqueue(self, item):
+        await self.put(item)
+
+    async def dequeue(self):
+        return await self.get()
+
+    async def enqueue_many(self, items):
+        """Non-blocking: enqueue items until the queue is full; return how many fit."""
+        async with self._changed:
+            added = super().enqueue_many(items)
+            self._changed.notify_all()
+            return added
+
+    async def dequeue_many(self, count):
+        """Non-blocking: remove and return up to count items."""
+        async with self._changed:
+            batch = super().dequeue_many(count)
+            self._changed.notify_all()
+            return batch
+
+
+def _run_benchmark(total: int = 1_000_000, capacity: int = 10_000) -> None:
+    """Move `total` items through a BlockingQueue with P producers / C consumers."""
+    stop = object()
+    for producers, consumers in ((1, 1), (2, 2), (4, 4)):
+        for batch in (1, 256):
+            q = BlockingQueue(capacity)
+            per_producer = total // producers
+
+            def produce():
+                if batch == 1:
+                    for i in range(per_producer):
+                        q.put(i)
+                else:
+                    for lo in range(0, per_producer, batch):
+                        q.put_many(range(lo, min(lo + batch, per_producer)))
+
+            def consume():
+                while True:
+                    items = [q.get()] if batch == 1 else q.get_many(batch)
+                    if stop in items:
+                        q.put(stop)  # let the other consumers see it too
+                        return
+
+            threads = [threading.Thread(target=consume) for _ in range(consumers)]
+            threads += [threading.Thread(target=produce) for _ in range(producers)]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads[consumers:]:
+                thread.join()
+            q.put(stop)
+            for thread in threads[:consumers]:
+                thread.join()
+            elapsed = time.perf_counter() - start
+            print(f"{producers}P/{consumers}C batch={batch:<4} {per_producer * producers / elapsed / 1e6:6.2f} M items/s")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if "--bench" in sys.argv[1:]:
+        _run_benchmark()
+        sys.exit(0)
+
+    # Quick checks
+    q = BlockingQueue(capacity=2)
+    q.put_many([1, 2])
+    try:
+        q.put(3, timeout=0.01)
+    except queue.Full:
+        pass
+    else:
+        raise AssertionError("put on a full queue did not time out")
+    threading.Timer(0.05, q.get).start()
+    q.put(3, timeout=1.0)  # unblocked when the timer frees a slot
+    assert q.get_many(10) == [2, 3]
+    try:
+        q.get(timeout=0.01)
+    except queue.Empty:
+        pass
+    else:
+        raise AssertionError("get on an empty queue did not time out")
+    assert q.peek() == "Queue is empty. Nothing to peek."
+    assert q.is_empty() and not q.is_full() and q.size() == 0
+
+    async def _async_checks():
+        aq = AsyncQueue(capacity=2)
+        await aq.put_many([1, 2])
+        consumer = asyncio.ensure_future(aq.get_many(5))
+        await aq.put(3, timeout=1.0)
+        assert await consumer == [1, 2]
+        assert await aq.get() == 3
+        waiter = asyncio.ensure_future(aq.get(timeout=1.0))
+        await asyncio.sleep(0)
+        await aq.enqueue("x")  # wakes the waiting get()
+        assert await waiter == "x"
+        assert await aq.enqueue_many(iter([4, 5, 6])) == 2
+        assert await aq.dequeue() == 4 and await aq.dequeue_many(5) == [5]
+        try:
+            await aq.get(timeout=0.01)
+        except asyncio.QueueEmpty:
+            pass
+        else:
+            raise AssertionError("async get on an empty queue did not time out")
+
+    asyncio.run(_async_checks())
+    print("All blocking_queue checks passed.")
@@ -0,0 +1,231 @@
+"""
+delay_queue.py
+Delay queue: items become visible to dequeue() only once their due time has passed.
+
+Pending items sit in a heapq of (due time, sequence number, item), so
+scheduling and taking an item are O(log n) each and there is no polling or
+re-enqueueing: a consumer blocked in get() sleeps on a condition until the
+earliest due time (or until an earlier item is scheduled). Items due at the
+same time come out in the order they were scheduled. schedule_many() adds a
+large batch with one O(n) heapify instead of n pushes.
+
+Due times are measured on time.monotonic() unless another clock is given.
+
+Usage:
+    q = DelayQueue()
+    q.enqueue("retry job 7", delay=2.5)
+    q.schedule_many((job, deadline) for job, deadline in jobs)
+    item = q.dequeue()          # blocks until the earliest item is due
+    due = q.dequeue_due(100)    # non-blocking: everything already due
+
+    python delay_queue.py --bench   # 10**6 pending timers
+"""
+import heapq
+import queue
+import threading
+import time
+from itertools import count
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+
+class DelayQueue:
+    """Thread-safe queue ordered by due time; dequeue() blocks until one is due.
+
+    Timeouts raise queue.Empty, as BlockingQueue does.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._sequence = count()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def schedule(self, item: Any, due: float) -> None:
+        """Make item visible at the absolute clock time `due`."""
+        with self._lock:
+            entry = (due, next(self._sequence), item)
+            heapq.heappush(self._heap, entry)
+            if self._heap[0] is entry:  # new earliest: waiters must re-arm
+                self._changed.notify()
+
+    def enqueue(self, item: Any, delay: float = 0.0) -> None:
+        """Make item visible `delay` seconds from now."""
+        self.schedule(item, self._clock() + delay)
+
+    def schedule_many(self, entries: Iterable[Tuple[Any, float]]) -> int:
+        """Schedule (item, due) pairs in bulk; return how many were added.
+
+        A batch at least as large as the queue is merged with one heapify
+        (O(n)); smaller batches are pushed one by one (O(k log n)).
+        """
+        batch = [(due, next(self._sequence), item) for item, due in entries]
+        with self._lock:
+            if len(batch) >= len(self._heap):
+                self._heap.extend(batch)
+                heapq.heapify(self._heap)
+            else:
+                for entry in batch:
+                    heapq.heappush(self._heap, entry)
+            self._changed.notify_all()
+        return len(batch)
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """Remove and return the earliest item, waiting until it is due.
+
+        Only the consumer woken for the current head re-arms its wait; after
+        taking an item it wakes the next waiter, so items due close together
+        reach several consumers without waiting on a later entry.
+
+        Waits at most `timeout` seconds in total, then raises queue.Empty.
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        with self._changed:
+            while True:
+                now = self._clock()
+                if self._heap and self._heap[0][0] <= now:
+                    item = heapq.heappop(self._heap)[2]
+                    if self._heap:  # hand off: the next waiter re-arms on the new head
+                        self._changed.notify()
+                    return item
+                wait = self._heap[0][0] - now if self._heap else None
+                if deadline is not None:
+                    if now >= deadline:
+                        if self._heap:  # pass on any wakeup this waiter absorbed
+                            self._changed.notify()
+                        raise queue.Empty
+                    wait = deadline - now if wait is None else min(wait, deadline - now)
+                self._changed.wait(wait)
+
+    def dequeue(self):
+        return self.get()
+
+    def dequeue_due(self, max_items: Optional[int] = None) -> List[Any]:
+        """Non-blocking: remove and return up to max_items items already due."""
+        ready = []
+        with self._lock:
+            now = self._clock()
+            heap = self._heap
+            while heap and heap[0][0] <= now and (max_items is None or len(ready) < max_items):
+                ready.append(heapq.heappop(heap)[2])
+        return ready
+
+    def peek(self):
+        """Return the item that will be due first, whether or not it is due yet."""
+        with self._lock:
+            if not self._heap:
+                return "Queue is empty. Nothing to peek."
+            return self._heap[0][2]
+
+    def next_due(self) -> Optional[float]:
+        """Clock time at which the earliest item becomes due (None if empty)."""
+        with self._lock:
+            return self._heap[0][0] if self._heap else None
+
+    def is_empty(self) -> bool:
+        return len(self._heap) == 0
+
+    def size(self) -> int:
+        """Number of pending items, due or not."""
+        return len(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+def _run_benchmark(n: int = 10**6) -> None:
+    import random
+
+    rng = random.Random(3)
+    offsets = [rng.random() for _ in range(n)]
+
+    q = DelayQueue()
+    now = time.monotonic()
+    start = time.perf_counter()
+    for i, offset in enumerate(offsets):
+        q.schedule(i, now + offset)
+    elapsed = time.perf_counter() - start
+    print(f"schedule()      {n:,} timers: {elapsed:6.2f} s  ({elapsed / n * 1e6:.2f} us each)")
+
+    q = DelayQueue()
+    now = time.monotonic()
+    start = time.perf_counter()
+    q.schedule_many((i, now + offset - 1.0) for i, offset in enumerate(offsets))  # all already due
+    elapsed = time.perf_counter() - start
+    print(f"schedule_many() {n:,} timers: {elapsed:6.2f} s  ({elapsed / n * 1e6:.2f} us each)")
+
+    start = time.perf_counter()
+    drained = 0
+    while drained < n:
+        drained += len(q.dequeue_due(4096))
+    elapsed = time.perf_counter() - start
+    print(f"dequeue_due()   {n:,} timers: {elapsed:6.2f} s  ({elapsed / n * 1e6:.2f} us each)")
+
+    # Blocking consumer: 1,000 timers falling due over 0.5 s, behind n timers
+    # that stay pending for an hour.
+    q = DelayQueue()
+    now = time.monotonic()
+    q.schedule_many((i, now + 3600 + offset) for i, offset in enumerate(offsets))
+    now = time.monotonic()
+    q.schedule_many((i, now + 0.1 + offset / 2) for i, offset in enumerate(offsets[:1000]))
+    lateness = []
+    for _ in range(1000):
+        due = q.next_due()
+        q.dequeue()
+        lateness.append(time.monotonic() - due)
+    lateness.sort()
+    print(
+        f"dequeue() with {len(q):,} pending: lateness median {lateness[500] * 1e3:.3f} ms, "
+        f"p99 {lateness[990] * 1e3:.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    import sys
+
+    if "--bench" in sys.argv[1:]:
+        _run_benchmark()
+        sys.exit(0)
+
+    # Quick checks
+    q = DelayQueue()
+    q.enqueue("late", delay=0.05)
+    q.enqueue("first", delay=0.0)
+    q.enqueue("second", delay=0.0)
+    assert q.dequeue_due() == ["first", "second"]
+    try:
+        q.get(timeout=0.01)
+    except queue.Empty:
+        pass
+    else:
+        raise AssertionError("an item was returned before it was due")
+    start = time.monotonic()
+    assert q.dequeue() == "late" and time.monotonic() - start >= 0.03
+
+    # A consumer waiting on a far-off item wakes for an earlier one.
+    q.enqueue("far", delay=60)
+    threading.Timer(0.02, q.enqueue, args=("soon",)).start()
+    assert q.get(timeout=1.0) == "soon"
+    assert q.peek() == "far" and q.size() == 1
+    assert q.schedule_many([("a", 0.0), ("b", 0.0)]) == 2
+    assert q.dequeue_due() == ["a", "b"]
+
+    # Several consumers parked on a far-off item all wake for earlier ones.
+    q = DelayQueue()
+    q.enqueue("far", delay=3.0)
+    taken = []
+    consumers = [
+        threading.Thread(target=lambda: taken.append((q.get(timeout=5.0), time.monotonic())))
+        for _ in range(2)
+    ]
+    for consumer in consumers:
+        consumer.start()
+    time.sleep(0.05)
+    start = time.monotonic()
+    q.enqueue("x", delay=0.1)
+    q.enqueue("y", delay=0.1)
+    for consumer in consumers:
+        consumer.join()
+    assert sorted(item for item, _ in taken) == ["x", "y"]
+    assert all(at - start < 1.0 for _, at in taken), "a due item waited on a later entry"
+    print("All delay_queue checks passed.")
@@ -0,0 +1,227 @@
+import decimal
+import math
+from fractions import Fraction
+from typing import Any, List
+
+# Below this n the factorial is cheap enough to measure directly.
+_SMALL_N = 32
+
+# Bernoulli numbers B_2, B_4, ... cached by _bernoulli_even().
+_BERNOULLI: List[Fraction] = []
+
+# Stirling's series for lgamma is accurate to double precision from here on.
+_STIRLING_MIN = 20
+
+
+def _check(n: int) -> None:
+	if n < 0:
+		raise ValueError("factorial is not defined for negative integers")
+
+
+def trailing_zeros(n: int) -> int:
+	"""Return the number of trailing zeros of n! using Legendre's formula.
+
+	The exponent of 5 in n! is sum(n // 5^k), and there are always more 2s
+	than 5s, so that sum is the trailing-zero count. O(log n).
+
+	Args:
+		n: Non-negative integer.
+
+	Returns:
+		The number of trailing decimal zeros of n!.
+	"""
+	_check(n)
+	count = 0
+	while n:
+		n //= 5
+		count += n
+	return count
+
+
+def log10_factorial(n: int) -> float:
+	"""Return log10(n!) in O(1) via math.lgamma(n + 1)."""
+	_check(n)
+	return math.lgamma(n + 1) / math.log(10)
+
+
+def _bernoulli_even(count: int) -> List[Fraction]:
+	"""Return [B_2, B_4, ..., B_2count] as exact fractions (Akiyama-Tanigawa)."""
+	while len(_BERNOULLI) < count:
+		m = 2 * len(_BERNOULLI) + 2
+		row = [Fraction(1, j + 1) for j in range(m + 1)]
+		for i in range(m):
+			for j in range(m - i):
+				row[j] = (j + 1) * (row[j] - row[j + 1])
+		_BERNOULLI.append(row[0])
+	return _BERNOULLI[:count]
+
+
+def digit_count(n: int) -> int:
+	"""Return the number of decimal digits of n! without computing it.
+
+	Evaluates Stirling's series (the natural-log form of Kamenetsky's formula)
+		ln(n!) ~ n*ln(n) - n + ln(2*pi*n)/2 + sum B_2k / (2k(2k-1) n^(2k-1))
+	in decimal arithmetic carrying every digit of the integer part plus
+	extra guard digits, so it stays exact for n far beyond the range of a
+	float. The answer floor(log10(n!)) + 1 is returned once the fractional
+	part is clear of an integer by more than the truncation error (the first
+	omitted term) plus the rounding error; until then precision is doubled
+	and one more series term is added. log10(n!) is never an integer for
+	n >= 2, so the loop ends.
+
+	Args:
+		n: Non-negative integer.
+
+	Returns:
+		len(str(n!)).
+	"""
+	_check(n)
+	if n < _SMALL_N:
+		return len(str(math.factorial(n)))
+
+	guard, terms = 30, 3
+	while True:
+		with decimal.localcontext() as ctx:
+			ctx.prec = 2 * len(str(n)) + guard
+			d = decimal.Decimal(n)
+			pi = _decimal_pi()
+			ln_factorial = d * d.ln() - d + (2 * pi * d).ln() / 2
+			coefficients = _bernoulli_even(terms + 1)
+			for k, b in enumerate(coefficients[:terms], start=1):
+				ln_factorial += decimal.Decimal(b.numerator) / (b.denominator * 2 * k * (2 * k - 1) * d ** (2 * k - 1))
+			b = coefficients[terms]
+			truncation = abs(decimal.Decimal(b.numerator) / (b.denominator * 2 * (terms + 1) * (2 * terms + 1) * d ** (2 * terms + 1)))
+			estimate = ln_factorial / decimal.Decimal(10).ln()
+			margin = truncation + decimal.Decimal(10) ** (len(str(n)) + 5 - ctx.prec)
+			floor = int(estimate)
+			fraction = estimate - floor
+			if margin < fraction < 1 - margin:
+				return floor + 1
+		guard *= 2
+		terms += 1
+
+
+def _decimal_pi() -> decimal.Decimal:
+	"""pi to the current decimal precision (Machin's formula)."""
+	ctx = decimal.getcontext()
+	ctx.prec += 5
+
+	def arctan_inverse(x: int) -> decimal.Decimal:
+		total = term = decimal.Decimal(1) / x
+		x2, k, sign = x * x, 1, -1
+		eps = decimal.Decimal(10) ** (-ctx.prec)
+		while abs(term) > eps:
+			term /= x2
+			k += 2
+			total += sign * term / k
+			sign = -sign
+		return total
+
+	pi = 16 * arctan_inverse(5) - 4 * arctan_inverse(239)
+	ctx.prec -= 5
+	return +pi
+
+
+def _as_array(values: Any):
+	"""Return (numpy, values) if values is a NumPy array, else (None, values).
+
+	Only signed and unsigned integer arrays are accepted; casting a float
+	array would silently truncate its values.
+	"""
+	try:
+		import numpy as np
+	except ImportError:
+		return None, values
+	if not isinstance(values, np.ndarray):
+		return None, values
+	if values.dtype.kind not in "iu":
+		raise TypeError(f"expected an integer array, got dtype {values.dtype}")
+	if values.size and values.min() < 0:
+		raise ValueError("factorial is not defined for negative integers")
+	return np, values
+
+
+def trailing_zeros_many(values: Any) -> Any:
+	"""trailing_zeros() over a scalar or a NumPy integer array.
+
+	Arrays are handled with one vectorised floor division per power of 5,
+	i.e. O(log max(values)) array passes. Unsigned arrays stay uint64 so
+	values of 2**63 and above are not wrapped negative.
+	"""
+	np, values = _as_array(values)
+	if np is None:
+		return trailing_zeros(values)
+	n = values.astype(np.uint64 if values.dtype.kind == "u" else np.int64)
+	count = np.zeros_like(n)
+	while n.any():
+		n //= 5
+		count += n
+	return count
+
+
+def log10_factorial_many(values: Any) -> Any:
+	"""log10_factorial() over a scalar or a NumPy array.
+
+	Uses Stirling's series for lgamma(n + 1) on the whole array at once, with
+	a small lookup table for n below _STIRLING_MIN.
+	"""
+	np, values = _as_array(values)
+	if np is None:
+		return log10_factorial(values)
+	n = values.astype(np.float64)
+	x = np.maximum(n, _STIRLING_MIN) + 1
+	series = (
+		(x - 0.5) * np.log(x) - x + 0.5 * math.log(2 * math.pi)
+		+ 1 / (12 * x) - 1 / (360 * x**3) + 1 / (1260 * x**5)
+	)
+	small = np.array([math.lgamma(k + 1) for k in range(_STIRLING_MIN)])
+	index = np.minimum(n, _STIRLING_MIN - 1).astype(np.int64)
+	return np.where(n < _STIRLING_MIN, small[index], series) / math.log(10)
+
+
+def digit_count_many(values: Any) -> Any:
+	"""digit_count() over a scalar or a NumPy integer array.
+
+	Each element needs its own high-precision evaluation, so arrays are
+	mapped element by element.
+	"""
+	np, values = _as_array(values)
+	if np is None:
+		return digit_count(values)
+	return np.vectorize(lambda v: digit_count(int(v)), otypes=[np.int64])(values)
+
+
+if __name__ == "__main__":
+	import sys
+
+	sys.set_int_max_str_digits(0)
+
+	# Quick checks against the real factorials
+	for n in list(range(0, 200)) + [1000, 4321, 10**4]:
+		exact = str(math.factorial(n))
+		assert digit_count(n) == len(exact), f"digit_count failed for {n}"
+		assert trailing_zeros(n) == len(exact) - len(exact.rstrip("0")), f"trailing_zeros failed for {n}"
+		assert abs(log10_factorial(n) - math.log10(math.factorial(n))) < 1e-9 * max(1, n)
+
+	# Huge inputs stay O(1)/O(log n)
+	print("digits of (10**18)! =", digit_count(10**18))
+	print("trailing zeros of (10**18)! =", trailing_zeros(10**18))
+
+	try:
+		import numpy as np
+	except ImportError:
+		print("NumPy not installed; skipped array checks.")
+	else:
+		arr = np.arange(0, 500)
+		assert (trailing_zeros_many(arr) == [trailing_zeros(int(v)) for v in arr]).all()
+		assert (digit_count_many(arr) == [digit_count(int(v)) for v in arr]).all()
+		assert np.allclose(log10_factorial_many(arr), [log10_factorial(int(v)) for v in arr], rtol=1e-12, atol=1e-12)
+		big = np.array([2**63 + 5, 2**64 - 1], dtype=np.uint64)
+		assert trailing_zeros_many(big).tolist() == [trailing_zeros(int(v)) for v in big]
+		try:
+			trailing_zeros_many(np.array([10.7]))
+		except TypeError:
+			pass
+		else:
+			raise AssertionError("a float array was accepted")
+	print("All factorial_analytics checks passed.")
@@ -0,0 +1,258 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence
+
+from prime_sieve import primes_up_to
+
+# Algorithms understood by factorial(n, method=...).
+METHODS = ("loop", "split", "swing", "parallel")
+
+# Sub-ranges handed out per worker by factorial_parallel(); a few per worker
+# evens out the load, since later ranges hold larger numbers.
+_CHUNKS_PER_WORKER = 4
+
+# Below this n the pool start-up costs more than it can save.
+_PARALLEL_MIN_N = 20_000
+
+# Below this many factors a plain loop beats further splitting.
+_LEAF_SIZE = 16
+
+
+def range_product(lo: int, hi: int) -> int:
+	"""Return lo * (lo + 1) * ... * hi using a balanced product tree.
+
+	Splitting the range in half keeps both operands of every multiplication
+	about the same size, which is what lets CPython's Karatsuba multiply pay
+	off; the naive running product multiplies a huge int by a tiny one n
+	times. Recursion depth is only O(log(hi - lo)).
+
+	Args:
+		lo: First factor.
+		hi: Last factor (an empty range, hi < lo, gives 1).
+
+	Returns:
+		The product of all integers in [lo, hi].
+	"""
+	if hi - lo < _LEAF_SIZE:
+		result = 1
+		for i in range(lo, hi + 1):
+			result *= i
+		return result
+	mid = (lo + hi) // 2
+	return range_product(lo, mid) * range_product(mid + 1, hi)
+
+
+def _odd_range_product(lo: int, hi: int) -> int:
+	"""Return the product of the odd integers in [lo, hi] as a product tree."""
+	lo |= 1
+	if hi < lo:
+		return 1
+	if hi - lo < 2 * _LEAF_SIZE:
+		result = 1
+		for i in range(lo, hi + 1, 2):
+			result *= i
+		return result
+	mid = ((lo + hi) // 2) | 1
+	return _odd_range_product(lo, mid) * _odd_range_product(mid + 2, hi)
+
+
+def factorial_split(n: int) -> int:
+	"""Return n! by binary splitting of its odd part.
+
+	n! = 2^(n - popcount(n)) * prod_i L_i^(i+1), where L_i is the product of
+	the odd numbers in (n >> (i+1), n >> i]. Accumulating the L_i from the
+	top keeps the operands balanced, and the power of two becomes a single
+	shift instead of n/2 multiplications by even numbers.
+	"""
+	inner = outer = 1
+	for i in range(n.bit_length() - 1, -1, -1):
+		inner *= _odd_range_product((n >> (i + 1)) + 1, n >> i)
+		outer *= inner
+	return outer << (n - bin(n).count("1"))
+
+
+def tree_product(values: Sequence[int]) -> int:
+	"""Return the product of values, multiplied pairwise as a balanced tree."""
+	items: List[int] = list(values)
+	if not items:
+		return 1
+	while len(items) > 1:
+		paired = [items[i] * items[i + 1] for i in range(0, len(items) - 1, 2)]
+		if len(items) % 2:
+			paired.append(items[-1])
+		items = paired
+	return items[0]
+
+
+def _swing(n: int, primes: Sequence[int]) -> int:
+	"""Return the swinging factorial n! / ((n // 2)!)^2 from its prime factors.
+
+	The exponent of p in the swing is the number of k >= 1 for which
+	floor(n / p^k) is odd, so every exponent is at most log_p(n) and the
+	result is a product of distinct, small prime powers.
+	"""
+	factors = []
+	for p in primes:
+		if p > n:
+			break
+		q, power = n, 1
+		while True:
+			q //= p
+			if q == 0:
+				break
+			if q & 1:
+				power *= p
+		if power > 1:
+			factors.append(power)
+	return tree_product(factors)
+
+
+def factorial_swing(n: int) -> int:
+	"""Return n! via the prime-swing recursion n! = ((n // 2)!)^2 * swing(n).
+
+	All primes up to n are sieved once and shared by every level, and the
+	recursion halves n each time, so depth is only O(log n).
+	"""
+	primes = primes_up_to(n)
+
+	def _fact(m: int) -> int:
+		if m < 2:
+			return 1
+		half = _fact(m // 2)
+		return half * half * _swing(m, primes)
+
+	return _fact(n)
+
+
+def factorial_parallel(n: int, workers: Optional[int] = None) -> int:
+	"""Return n! by multiplying sub-ranges of [2, n] on a process pool.
+
+	The range is cut into contiguous slices, each worker reduces its slices
+	with range_product(), and the partial products are combined in the
+	parent with a balanced tree_product(). Partial products travel back as
+	pickled ints, whose wire format is the raw little-endian byte string,
+	so the transfer is linear in their size.
+
+	Args:
+		n: Non-negative integer whose factorial is required.
+		workers: Pool size (default: os.cpu_count()). One worker, or a small
+			n, skips the pool and runs factorial_split() in-process.
+	"""
+	workers = workers or os.cpu_count() or 1
+	if workers <= 1 or n < _PARALLEL_MIN_N:
+		return factorial_split(n)
+	return _pool_factorial(n, workers)
+
+
+def _pool_factorial(n: int, workers: int) -> int:
+	"""The pool path of factorial_parallel(), without the small-n shortcut."""
+	if n < 2:
+		return 1
+	chunks = workers * _CHUNKS_PER_WORKER
+	bounds = [2 + (n - 1) * k // chunks for k in range(chunks + 1)]
+	los = bounds[:-1]
+	his = [b - 1 for b in bounds[1:]]
+	his[-1] = n
+	with ProcessPoolExecutor(max_workers=workers) as pool:
+		partials = list(pool.map(range_product, los, his))
+	return tree_product(partials)
+
+
+def factorial(n: int, method: str = "split") -> int:
+	"""Compute n! with the selected algorithm.
+
+	Raises ValueError for negative inputs or an unknown method.
+
+	Args:
+		n: Non-negative integer whose factorial is required.
+		method: "split" (binary splitting of the odd part), "swing"
+			(prime-swing / prime factorisation), "parallel" (sub-products
+			on a process pool with the default worker count) or "loop"
+			(the plain running product, quadratic overall).
+
+	Returns:
+		The factorial of n as an int.
+	"""
+	if n < 0:
+		raise ValueError("factorial is not defined for negative integers")
+	if method == "split":
+		return factorial_split(n)
+	if method == "swing":
+		return factorial_swing(n)
+	if method == "parallel":
+		return factorial_parallel(n)
+	if method == "loop":
+		result = 1
+		for i in range(2, n + 1):
+			result *= i
+		return result
+	raise ValueError(f"unknown method {method!r}; expected one of {METHODS}")
+
+
+def _run_benchmarks() -> None:
+	"""Time each method against math.factorial for n up to 10**6."""
+	import math
+	import time
+
+	limits = {"loop": 10**5}
+	# "parallel" is measured separately by --bench-parallel
+	methods = tuple(m for m in METHODS if m != "parallel")
+	sizes = (10**3, 10**4, 10**5, 10**6)
+	print(f"{'method':<8}" + "".join(f"{'n=' + str(n):>14}" for n in sizes))
+	for name in ("math",) + methods:
+		row = f"{name:<8}"
+		for n in sizes:
+			if n > limits.get(name, n):
+				row += f"{'skipped':>14}"
+				continue
+			start = time.perf_counter()
+			value = math.factorial(n) if name == "math" else factorial(n, name)
+			elapsed = time.perf_counter() - start
+			if name != "math":
+				assert value == math.factorial(n), f"{name} disagrees at n={n}"
+			row += f"{elapsed:>12.3f} s"
+		print(row)
+
+
+def _run_scaling_benchmark(n: int) -> None:
+	"""Time the process-pool path for 1..os.cpu_count() workers.
+
+	workers=1 also goes through a (one-process) pool, so every speed-up is
+	measured against the same algorithm rather than factorial_split().
+	"""
+	import time
+
+	baseline = None
+	for workers in range(1, (os.cpu_count() or 1) + 1):
+		start = time.perf_counter()
+		_pool_factorial(n, workers)
+		elapsed = time.perf_counter() - start
+		baseline = baseline or elapsed
+		print(f"workers={workers:<3} {elapsed:>9.3f} s   speed-up {baseline / elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+	import math
+	import sys
+
+	if "--bench" in sys.argv[1:]:
+		_run_benchmarks()
+		sys.exit(0)
+	if sys.argv[1:2] == ["--bench-parallel"]:
+		_run_scaling_benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 10**6)
+		sys.exit(0)
+
+	# Quick checks against math.factorial
+	for method in METHODS:
+		for n in list(range(0, 60)) + [1000, 4097]:
+			got = factorial(n, method)
+			assert got == math.factorial(n), f"{method} failed for {n}"
+		try:
+			factorial(-1, method)
+		except ValueError:
+			pass
+		else:
+			raise AssertionError(f"{method} did not raise for negative input")
+	for n in (_PARALLEL_MIN_N, 54_321):
+		assert factorial_parallel(n, workers=3) == math.factorial(n), f"parallel failed for {n}"
+	print("All factorial_engine checks passed.")
@@ -0,0 +1,215 @@
+import mmap
+import os
+import struct
+from array import array
+from typing import Optional, Union
+
+from task2 import is_prime
+
+# File layout: header, then `size` factorials, then `size` inverse factorials,
+# all as little-endian unsigned 64-bit words.
+_MAGIC = b"FTBL"
+_HEADER = struct.Struct("<4sIQQ")  # magic, version, p, size
+_VERSION = 1
+
+# build() without an explicit size covers min(p, DEFAULT_SIZE) residues:
+# 2**22 entries are 64 MiB of tables and a few seconds of building. A table
+# only supports Lucas queries (n >= size) when it covers every residue, so
+# the default gives that for p <= DEFAULT_SIZE; larger p (e.g. 10**9 + 7)
+# get a table for n < DEFAULT_SIZE unless a size is passed.
+DEFAULT_SIZE = 1 << 22
+
+Buffer = Union[array, memoryview]
+
+
+class FactorialTable:
+	"""Factorials and inverse factorials mod a prime p for O(1) nCr / nPr.
+
+	fact[i] is i! mod p (the running product factorial_iterative computes,
+	reduced at every step) and inv_fact[i] is its modular inverse, for
+	0 <= i < size. Tables are built once, saved with save(), and reopened
+	with load(), which memory-maps the file so start-up cost does not grow
+	with the table and untouched pages are never read.
+
+	Queries with n beyond the table fall back to Lucas' theorem, which needs
+	the table to cover every residue 0 <= i < p; that is only the default
+	for p <= DEFAULT_SIZE (see build()).
+	"""
+
+	def __init__(self, p: int, fact: Buffer, inv_fact: Buffer, _mapping: Optional[mmap.mmap] = None):
+		self.p = p
+		self.fact = fact
+		self.inv_fact = inv_fact
+		self._mapping = _mapping
+
+	@classmethod
+	def build(cls, p: int, size: Optional[int] = None) -> "FactorialTable":
+		"""Precompute tables for 0 <= i < size.
+
+		size defaults to min(p, DEFAULT_SIZE) and is capped at p; Lucas
+		queries need the table to reach p, which for a large prime means
+		passing size=p explicitly (8 bytes * 2 * p, built in a Python loop).
+
+		Raises ValueError if p is not a prime below 2**32 (so every product
+		of two residues fits in 64 bits) or size is not positive.
+		"""
+		if not is_prime(p) or p >= 2**32:
+			raise ValueError("p must be a prime below 2**32")
+		size = min(p, DEFAULT_SIZE if size is None else size)
+		if size <= 0:
+			raise ValueError("size must be a positive integer")
+
+		fact = array("Q", bytes(8 * size))
+		fact[0] = 1
+		for i in range(1, size):
+			fact[i] = fact[i - 1] * i % p
+		inv_fact = array("Q", bytes(8 * size))
+		inv_fact[size - 1] = pow(fact[size - 1], p - 2, p)
+		for i in range(size - 1, 0, -1):
+			inv_fact[i - 1] = inv_fact[i] * i % p
+		return cls(p, fact, inv_fact)
+
+	def save(self, path: str) -> None:
+		"""Write the tables to `path` in the layout load() expects."""
+		with open(path, "wb") as handle:
+			handle.write(_HEADER.pack(_MAGIC, _VERSION, self.p, len(self)))
+			handle.write(memoryview(self.fact).cast("B"))
+			handle.write(memoryview(self.inv_fact).cast("B"))
+
+	@classmethod
+	def load(cls, path: str) -> "FactorialTable":
+		"""Memory-map tables written by save().
+
+		Raises ValueError if the file is not a factorial table.
+		"""
+		error = ValueError(f"{path} is not a version {_VERSION} factorial table")
+		with open(path, "rb") as handle:
+			if os.fstat(handle.fileno()).st_size < _HEADER.size:
+				raise error  # also covers empty files, which mmap rejects
+			mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+		magic, version, p, size = _HEADER.unpack_from(mapping)
+		if magic != _MAGIC or version != _VERSION or len(mapping) != _HEADER.size + 16 * size:
+			mapping.close()
+			raise error
+		words = memoryview(mapping)[_HEADER.size:].cast("Q")
+		return cls(p, words[:size], words[size:], _mapping=mapping)
+
+	def close(self) -> None:
+		"""Release the memory mapping of a table opened with load()."""
+		if self._mapping is not None:
+			self.fact.release()
+			self.inv_fact.release()
+			self._mapping.close()
+			self._mapping = None
+
+	def __len__(self) -> int:
+		return len(self.fact)
+
+	def as_numpy(self):
+		"""Return (fact, inv_fact) as zero-copy NumPy uint64 arrays.
+
+		Raises ImportError if NumPy is not installed.
+		"""
+		import numpy as np
+
+		return np.frombuffer(self.fact, dtype=np.uint64), np.frombuffer(self.inv_fact, dtype=np.uint64)
+
+	def factorial(self, n: int) -> int:
+		"""Return n! mod p (zero once n >= p)."""
+		if n < 0:
+			raise ValueError("factorial is not defined for negative integers")
+		if n >= self.p:
+			return 0
+		return self.fact[self._index(n)]
+
+	def nCr(self, n: int, r: int) -> int:
+		"""Return C(n, r) mod p in O(1) inside the table, O(log_p n) beyond it."""
+		if n < 0 or r < 0:
+			raise ValueError("n and r must be non-negative integers")
+		if r > n:
+			return 0
+		if n < len(self):
+			return self.fact[n] * self.inv_fact[r] % self.p * self.inv_fact[n - r] % self.p
+		# Lucas: C(n, r) = prod C(n_i, r_i) over the base-p digits of n and r.
+		self._require_full("nCr", n)
+		p, fact, inv_fact = self.p, self.fact, self.inv_fact
+		result = 1
+		while r:
+			n_i, r_i = n % p, r % p
+			if r_i > n_i:
+				return 0
+			result = result * fact[n_i] % p * inv_fact[r_i] % p * inv_fact[n_i - r_i] % p
+			n //= p
+			r //= p
+		return result
+
+	def nPr(self, n: int, r: int) -> int:
+		"""Return n! / (n - r)! mod p in O(1)."""
+		if n < 0 or r < 0:
+			raise ValueError("n and r must be non-negative integers")
+		if r > n:
+			return 0
+		if n < len(self):
+			return self.fact[n] * self.inv_fact[n - r] % self.p
+		# r consecutive integers ending at n contain a multiple of p exactly
+		# when r > n mod p; otherwise their residues are (n%p - r, n%p].
+		self._require_full("nPr", n)
+		top = n % self.p
+		if r > top:
+			return 0
+		return self.fact[top] * self.inv_fact[top - r] % self.p
+
+	def _index(self, n: int) -> int:
+		if n >= len(self):
+			raise ValueError(f"n={n} is beyond the table size {len(self)}")
+		return n
+
+	def _require_full(self, name: str, n: int) -> None:
+		if len(self) < self.p:
+			raise ValueError(
+				f"{name} for n={n} needs a table covering all residues mod {self.p} "
+				f"(this one has {len(self)})"
+			)
+
+
+if __name__ == "__main__":
+	import math
+	import tempfile
+
+	# Quick checks against math.comb / math.perm
+	for p in (2, 7, 13):
+		table = FactorialTable.build(p)
+		for n in range(0, 60):
+			for r in range(0, n + 2):
+				assert table.nCr(n, r) == math.comb(n, r) % p, f"nCr({n}, {r}) mod {p}"
+				assert table.nPr(n, r) == math.perm(n, r) % p, f"nPr({n}, {r}) mod {p}"
+
+	p = 1_000_000_007
+	assert len(FactorialTable.build(1_048_583)) == 1_048_583  # full table by default
+	table = FactorialTable.build(p, size=10**5)
+	path = os.path.join(tempfile.mkdtemp(), "fact.tbl")
+	table.save(path)
+	loaded = FactorialTable.load(path)
+	assert loaded.nCr(99_999, 31_337) == math.comb(99_999, 31_337) % p
+	assert loaded.nPr(5_000, 1_234) == math.perm(5_000, 1_234) % p
+	assert loaded.factorial(4_321) == math.factorial(4_321) % p
+	try:
+		loaded.nCr(10**6, 3)
+	except ValueError:
+		pass
+	else:
+		raise AssertionError("partial table should refuse Lucas queries")
+	loaded.close()
+	with open(path, "rb") as handle:
+		truncated = handle.read(100)
+	for data in (b"", b"FTBL", truncated):
+		with open(path, "wb") as handle:
+			handle.write(data)
+		try:
+			FactorialTable.load(path)
+		except ValueError:
+			pass
+		else:
+			raise AssertionError(f"a {len(data)}-byte file was loaded")
+	os.remove(path)
+	print("All factorial_tables checks passed.")
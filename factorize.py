@@ -0,0 +1,174 @@
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from math import gcd
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from prime_sieve import primes_up_to
+from task2 import is_prime
+
+# Factors below this bound are removed by trial division before Pollard rho.
+TRIAL_LIMIT = 10_000
+_TRIAL_PRIMES = primes_up_to(TRIAL_LIMIT - 1)
+
+# Number of recently factored values kept by the LRU cache.
+CACHE_SIZE = 4096
+
+# Pollard-Brent multiplies this many |x - y| terms together before each gcd.
+_GCD_BATCH = 128
+
+
+def _pollard_brent(n: int, rng: random.Random) -> int:
+	"""Return a non-trivial factor of the odd composite n.
+
+	Pollard rho with Brent's cycle detection: the tortoise x only jumps at
+	powers of two, and the differences |x - y| are multiplied together so a
+	gcd is taken once per _GCD_BATCH steps instead of every step. If a batch
+	overshoots (gcd == n), the last batch is replayed one step at a time; if
+	even that fails, a new polynomial constant is tried.
+	"""
+	while True:
+		y, c = rng.randrange(1, n), rng.randrange(1, n)
+		g = r = q = 1
+		x = ys = y
+		while g == 1:
+			x = y
+			for _ in range(r):
+				y = (y * y + c) % n
+			k = 0
+			while k < r and g == 1:
+				ys = y
+				for _ in range(min(_GCD_BATCH, r - k)):
+					y = (y * y + c) % n
+					q = q * abs(x - y) % n
+				g = gcd(q, n)
+				k += _GCD_BATCH
+			r *= 2
+		if g == n:
+			g = 1
+			while g == 1:
+				ys = (ys * ys + c) % n
+				g = gcd(abs(x - ys), n)
+		if g != n:
+			return g
+
+
+def _split(n: int, factors: Counter, rng: random.Random) -> None:
+	"""Add the prime factorisation of n (free of small factors) to factors."""
+	stack = [n]
+	while stack:
+		m = stack.pop()
+		if m == 1:
+			continue
+		if is_prime(m):
+			factors[m] += 1
+			continue
+		d = _pollard_brent(m, rng)
+		stack.append(d)
+		stack.append(m // d)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _factor_cached(n: int) -> Tuple[Tuple[int, int], ...]:
+	factors: Counter = Counter()
+	for p in _TRIAL_PRIMES:
+		if p * p > n:
+			break
+		while n % p == 0:
+			factors[p] += 1
+			n //= p
+	if n > 1:
+		# Seeded from n so repeated runs follow the same rho walks.
+		_split(n, factors, random.Random(n))
+	return tuple(sorted(factors.items()))
+
+
+def factorize(n: int) -> Dict[int, int]:
+	"""Return the prime factorisation of n as {prime: exponent}.
+
+	Small factors are removed by trial division up to TRIAL_LIMIT, primality
+	of every cofactor is decided by task2.is_prime, and composite cofactors
+	are split by Pollard rho with Brent's improvements. Results are kept in
+	an LRU cache of the CACHE_SIZE most recent inputs.
+
+	Pollard rho needs about sqrt(p) steps to find a prime factor p, so a
+	20-40 digit number factors in well under a second unless its
+	second-largest prime factor has more than ~14 digits (e.g. a balanced
+	40-digit semiprime), which calls for ECM or a quadratic sieve instead.
+
+	Args:
+		n: Positive integer (1 gives an empty factorisation).
+
+	Returns:
+		A dict mapping each prime factor of n to its exponent.
+
+	Raises:
+		ValueError: If n is not a positive integer.
+	"""
+	if not isinstance(n, int) or n < 1:
+		raise ValueError("n must be a positive integer")
+	return dict(_factor_cached(n))
+
+
+def factorize_many(values: Iterable[int], workers: Optional[int] = None, chunksize: int = 16) -> List[Dict[int, int]]:
+	"""Factorise every value, in order, optionally on a process pool.
+
+	Args:
+		values: Positive integers to factorise.
+		workers: If greater than 1, values are distributed over a
+			ProcessPoolExecutor of this size in batches of `chunksize`.
+			Each worker process keeps its own LRU cache.
+		chunksize: Values sent to a worker per task.
+
+	Returns:
+		A list of factorisations, one per input value.
+	"""
+	if not workers or workers <= 1:
+		return [factorize(n) for n in values]
+	with ProcessPoolExecutor(max_workers=workers) as pool:
+		return list(pool.map(factorize, values, chunksize=chunksize))
+
+
+def cache_info():
+	"""Return hit/miss statistics of the factorisation LRU cache."""
+	return _factor_cached.cache_info()
+
+
+if __name__ == "__main__":
+	import time
+
+	# Quick checks: factorisations multiply back and contain only primes
+	def _check(n: int) -> Dict[int, int]:
+		factors = factorize(n)
+		product = 1
+		for p, e in factors.items():
+			assert is_prime(p), f"{p} is not prime (factoring {n})"
+			product *= p**e
+		assert product == n, f"factorisation of {n} multiplies to {product}"
+		return factors
+
+	for n in range(1, 5000):
+		_check(n)
+	assert factorize(2**64 + 1) == {274177: 1, 67280421310721: 1}
+	assert factorize(600851475143) == {71: 1, 839: 1, 1471: 1, 6857: 1}
+	try:
+		factorize(0)
+	except ValueError:
+		pass
+	else:
+		raise AssertionError("factorize(0) did not raise")
+
+	samples = [
+		(10**9 + 7) * (10**9 + 9) * 998_244_353,  # 27 digits
+		1_000_000_000_039 * 1_000_000_000_061,  # 25 digits, two 13-digit primes
+		(2**61 - 1) * (10**9 + 7) ** 2 * 3**5,  # 39 digits
+		12_345_678_901_234_567_890_123_456_789,
+	]
+	start = time.perf_counter()
+	for n in samples:
+		print(n, "=", " * ".join(f"{p}^{e}" if e > 1 else str(p) for p, e in _check(n).items()))
+	print(f"factored {len(samples)} values in {time.perf_counter() - start:.2f} s")
+	assert factorize_many(samples, workers=2) == [factorize(n) for n in samples]
+	print(cache_info())
+	print("All factorize checks passed.")
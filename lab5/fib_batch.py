@@ -0,0 +1,401 @@
+"""
+fib_batch.py
+Vectorised F(n) mod m for large NumPy arrays of indices.
+
+Usage:
+    python fib_batch.py            # smoke tests against fib_recursive.fib
+    python fib_batch.py --bench    # queries-per-second benchmark
+    # or import fib_mod_many / fib_mod_pairs from this module
+
+Notes:
+- Every index is first reduced modulo the Pisano period of m (cached per
+  modulus), so the exponentiation only walks ~log2(6m) bits, never log2(n).
+- The exponentiation is the 2x2 matrix power [[1, 1], [1, 0]]^n written in
+  its fast-doubling form: squaring the matrix is exactly
+      F(2k) = F(k) * (2F(k+1) - F(k)),  F(2k+1) = F(k)^2 + F(k+1)^2
+  and the whole array advances one bit per step in uint64 arithmetic.
+- Moduli whose period is too long for a full residue table use a split
+  table instead: the reduced index k = a * L + b (L ~ sqrt(period)) is
+  answered as F(a*L + 1) * F(b) + F(a*L) * F(b - 1), from two tables of
+  about sqrt(period) entries each, so a query costs two gathers and two
+  products instead of one doubling pass per bit of the period.
+- Overflow safety: every operand is kept reduced below m < 2**32, so a product plus
+  one reduced term always fits in 64 bits before it is reduced again.
+  Larger moduli fall back to exact Python integers (correct, but slow).
+"""
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Largest modulus handled by the uint64 fast path (m^2 + m stays < 2**64).
+MAX_VECTOR_MODULUS = 2**32 - 1
+
+# Moduli whose Pisano period is at most this long can get a full residue
+# table, turning every query into a single array lookup (8 bytes per entry).
+# A table is only built for a batch with at least `period` queries, since
+# building it costs about as much as answering that many queries directly.
+TABLE_PERIOD_LIMIT = 2**21
+
+# Total bytes of residue tables kept (and, separately, of split tables);
+# least recently used ones are dropped.
+TABLE_CACHE_BYTES = 64 * 2**20
+
+# Batches smaller than this skip the Pisano period (which needs m factored)
+# unless it is already cached, and run fast doubling over all 64 index bits.
+PERIOD_MIN_BATCH = 4096
+
+# Pisano period per modulus, filled on first use by pisano_period().
+_PISANO_CACHE: Dict[int, int] = {1: 1}
+
+# F(k) mod m for k in [0, pisano_period(m)), in least-recently-used order.
+_RESIDUE_TABLES: "OrderedDict[int, np.ndarray]" = OrderedDict()
+
+# Split tables per modulus, in least-recently-used order: row 0 holds F(b)
+# for b < L followed by F(a*L) for every a, row 1 holds F(b - 1) followed by
+# F(a*L + 1), where L = 2**_split_shift(period).
+_SPLIT_TABLES: "OrderedDict[int, np.ndarray]" = OrderedDict()
+
+
+def _fib_pair_mod(n: int, m: int) -> Tuple[int, int]:
+    """Return (F(n) mod m, F(n+1) mod m) with scalar fast doubling."""
+    a, b = 0, 1 % m
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a) % m
+        d = (a * a + b * b) % m
+        if bit == "1":
+            a, b = d, (c + d) % m
+        else:
+            a, b = c, d
+    return a, b
+
+
+def _factorize(m: int) -> Dict[int, int]:
+    """Return the prime factorisation of m as {prime: exponent}."""
+    factors: Dict[int, int] = {}
+    p = 2
+    while p * p <= m:
+        while m % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            m //= p
+        p += 1 if p == 2 else 2
+    if m > 1:
+        factors[m] = factors.get(m, 0) + 1
+    return factors
+
+
+def _divisors(n: int) -> List[int]:
+    """Return the divisors of n in increasing order."""
+    divisors = [1]
+    for p, k in _factorize(n).items():
+        divisors = [d * p**e for d in divisors for e in range(k + 1)]
+    return sorted(divisors)
+
+
+def _pisano_prime(p: int) -> int:
+    """Return the Pisano period of a prime p."""
+    if p == 2:
+        return 3
+    if p == 5:
+        return 20
+    # pi(p) divides p - 1 when p = +-1 (mod 5), and 2(p + 1) otherwise.
+    bound = p - 1 if p % 5 in (1, 4) else 2 * (p + 1)
+    for d in _divisors(bound):
+        if _fib_pair_mod(d, p) == (0, 1):
+            return d
+    return bound
+
+
+def pisano_period(m: int) -> int:
+    """Return a period of F(n) mod m, caching the result per modulus.
+
+    Uses pi(m) = lcm(pi(p^k)) over the prime powers of m and
+    pi(p^k) = p^(k-1) * pi(p). The second identity is only known to give a
+    multiple of the true period in general (equality is Wall's conjecture),
+    but any multiple is equally valid for reducing indices.
+
+    Raises:
+        ValueError: If m is not a positive integer.
+    """
+    if not isinstance(m, (int, np.integer)) or m <= 0:
+        raise ValueError("modulus must be a positive integer")
+    m = int(m)
+    cached = _PISANO_CACHE.get(m)
+    if cached is not None:
+        return cached
+
+    period = 1
+    for p, k in _factorize(m).items():
+        term = p ** (k - 1) * _pisano_prime(p)
+        period = period * term // math.gcd(period, term)
+    _PISANO_CACHE[m] = period
+    return period
+
+
+def _as_indices(indices) -> np.ndarray:
+    """Validate indices and return them as a uint64 array."""
+    arr = np.asarray(indices)
+    if arr.size == 0:  # np.asarray([]) is float64; an empty batch is still valid
+        return arr.astype(np.uint64)
+    if arr.dtype.kind not in "iu":
+        raise ValueError("indices must be an integer array")
+    if arr.dtype.kind == "i" and arr.size and arr.min() < 0:
+        raise ValueError("indices must be non-negative")
+    return arr.astype(np.uint64, copy=False)
+
+
+def fib_mod_many(indices, m: int) -> np.ndarray:
+    """Return F(n) mod m for every n in `indices`.
+
+    Args:
+        indices: Array-like of non-negative integers (any shape).
+        m: Positive integer modulus.
+
+    Returns:
+        A uint64 array of the same shape as `indices` (object dtype, computed
+        without the vector path, when m exceeds MAX_VECTOR_MODULUS).
+
+    Raises:
+        ValueError: If an index is negative or m is not a positive integer.
+
+    Complexity:
+        After the one-off Pisano period computation for m: a single gather
+        when a residue table is cached (built for batches of at least
+        `period` queries when the period is at most TABLE_PERIOD_LIMIT),
+        otherwise O(len(indices)) work against a split table (built for
+        batches of at least ~sqrt(period) queries), otherwise
+        O(len(indices) * log m) doubling passes. Batches below
+        PERIOD_MIN_BATCH skip the period for a modulus not seen before.
+    """
+    arr = _as_indices(indices)
+    if not isinstance(m, (int, np.integer)) or m <= 0:
+        raise ValueError("modulus must be a positive integer")
+    if m > MAX_VECTOR_MODULUS:
+        # Factoring huge moduli for the period would cost more than it saves.
+        m = int(m)
+        out = np.empty(arr.shape, dtype=object)
+        for pos, n in np.ndenumerate(arr):
+            out[pos] = _fib_pair_mod(int(n), m)[0]
+        return out
+
+    m = int(m)
+    if m not in _PISANO_CACHE and arr.size < PERIOD_MIN_BATCH:
+        return _fib_mod_doubling(arr, m, 2**64 - 1)
+
+    period = pisano_period(m)
+    reduced = arr % np.uint64(period)
+    table = _RESIDUE_TABLES.get(m)
+    if table is not None:
+        _RESIDUE_TABLES.move_to_end(m)
+        return table[reduced]
+    if period <= TABLE_PERIOD_LIMIT and arr.size >= period:
+        table = _fib_mod_doubling(np.arange(period, dtype=np.uint64), m, period)
+        _cache_table(m, table)
+        return table[reduced]
+    shift = _split_shift(period)
+    split = _SPLIT_TABLES.get(m)
+    if split is not None:
+        _SPLIT_TABLES.move_to_end(m)
+    elif arr.size >= 1 << shift:
+        split = _build_split_table(m, period, shift)
+        _cache_table(m, split, _SPLIT_TABLES)
+    if split is not None:
+        return _fib_mod_split(reduced, m, shift, split)
+    return _fib_mod_doubling(reduced, m, period)
+
+
+def _split_shift(period: int) -> int:
+    """Bits of the reduced index answered by the low half of a split table."""
+    return (int(period - 1).bit_length() + 1) // 2
+
+
+def _build_split_table(m: int, period: int, shift: int) -> np.ndarray:
+    """Return the (2, L + H) split table for m; see _SPLIT_TABLES."""
+    low = _fib_mod_doubling(np.arange(1 << shift, dtype=np.uint64), m, 1 << shift)
+    starts = np.arange(((period - 1) >> shift) + 1, dtype=np.uint64) << np.uint64(shift)
+    table = np.empty((2, low.size + starts.size), dtype=np.uint64)
+    table[0, :low.size] = low
+    table[1, 0] = 1 % m  # F(-1) = 1
+    table[1, 1:low.size] = low[:-1]
+    table[0, low.size:] = _fib_mod_doubling(starts, m, period)
+    table[1, low.size:] = _fib_mod_doubling(starts + np.uint64(1), m, period)
+    return table
+
+
+def _fib_mod_split(reduced: np.ndarray, m: int, shift: int, table: np.ndarray) -> np.ndarray:
+    """F(k) mod m for reduced k = a*L + b via F(a*L + 1) F(b) + F(a*L) F(b - 1)."""
+    mod = np.uint64(m)
+    low = reduced & np.uint64((1 << shift) - 1)
+    high = reduced >> np.uint64(shift)
+    high += np.uint64(1 << shift)  # the F(a*L) entries follow the L low ones
+    out = table[1][high]
+    out *= table[0][low]  # both factors below m < 2**32
+    out %= mod
+    term = table[0][high]
+    term *= table[1][low]
+    term %= mod
+    out += term
+    out %= mod
+    return out
+
+
+def _cache_table(m: int, table: np.ndarray, cache: "OrderedDict[int, np.ndarray]" = _RESIDUE_TABLES) -> None:
+    """Keep a table in `cache`, evicting old ones beyond TABLE_CACHE_BYTES."""
+    cache[m] = table
+    total = sum(t.nbytes for t in cache.values())
+    while total > TABLE_CACHE_BYTES and len(cache) > 1:
+        _, evicted = cache.popitem(last=False)
+        total -= evicted.nbytes
+
+
+def clear_caches() -> None:
+    """Drop every cached Pisano period, residue table and split table."""
+    _PISANO_CACHE.clear()
+    _PISANO_CACHE[1] = 1
+    _RESIDUE_TABLES.clear()
+    _SPLIT_TABLES.clear()
+
+
+def _fib_mod_doubling(reduced: np.ndarray, m, period: int) -> np.ndarray:
+    """Vectorised fast doubling for indices already reduced below `period`.
+
+    m is one modulus or a uint64 array of per-index moduli (all below 2**32).
+    """
+    mod = np.asarray(m, dtype=np.uint64)
+    one = np.uint64(1)
+    a = np.zeros(reduced.shape, dtype=np.uint64)
+    b = np.ones(reduced.shape, dtype=np.uint64) % mod
+    for shift in range(int(period).bit_length() - 1, -1, -1):
+        # Doubling step: (F(k), F(k+1)) -> (F(2k), F(2k+1)), all below m.
+        c = (b + b + mod - a) % mod
+        c *= a
+        c %= mod
+        a *= a
+        a %= mod
+        b *= b
+        b += a  # a^2 mod m + b^2 < 2**64 because m < 2**32
+        b %= mod
+        # Advance by one where this bit of the reduced index is set, using
+        # wrap-around arithmetic instead of np.where to avoid temporaries:
+        # (a, b) = (c + odd * (d - c), d + odd * c) is (c, d) or (d, c + d).
+        odd = (reduced >> np.uint64(shift)) & one
+        a = b - c
+        a *= odd
+        a += c
+        c *= odd
+        b += c
+        b %= mod
+    return a
+
+
+def fib_mod_pairs(indices, moduli) -> np.ndarray:
+    """Return F(n_i) mod m_i for paired arrays of indices and moduli.
+
+    Queries are sorted by modulus once and each run of equal moduli with
+    at least PERIOD_MIN_BATCH queries (or an already cached period) goes
+    through fib_mod_many(). All the other vector-range queries are answered
+    together by one fast-doubling pass with per-query moduli, so many
+    distinct moduli cost no per-group setup.
+    """
+    arr = _as_indices(indices)
+    mods = np.asarray(moduli)
+    if mods.shape != arr.shape:
+        raise ValueError("indices and moduli must have the same shape")
+    if mods.size and mods.dtype.kind not in "iu":
+        raise ValueError("moduli must be an integer array")
+    flat_arr, flat_mods = arr.ravel(), mods.ravel()
+    order = np.argsort(flat_mods, kind="stable")
+    groups, starts = np.unique(flat_mods[order], return_index=True)
+    wide = groups.size and int(groups.max()) > MAX_VECTOR_MODULUS
+    out = np.empty(flat_arr.shape, dtype=object if wide else np.uint64)
+    bounds = list(starts) + [order.size]
+    shared = []
+    for m, lo, hi in zip(groups, bounds, bounds[1:]):
+        positions = order[lo:hi]
+        m = int(m)
+        if hi - lo < PERIOD_MIN_BATCH and m not in _PISANO_CACHE and 0 < m <= MAX_VECTOR_MODULUS:
+            shared.append(positions)
+        else:
+            out[positions] = fib_mod_many(flat_arr[positions], m)
+    if shared:
+        positions = np.concatenate(shared)
+        out[positions] = _fib_mod_doubling(flat_arr[positions], flat_mods[positions].astype(np.uint64), 2**64 - 1)
+    return out.reshape(arr.shape)
+
+
+def _run_smoke_tests():
+    """Compare against the exact big-integer fib() for small inputs."""
+    from fib_recursive import fib
+
+    ns = np.arange(0, 200)
+    all_ok = True
+    for m in (1, 2, 7, 10, 1000, 10**9 + 7, 2**32 - 5, 2**32, 2**61 - 1):
+        got = fib_mod_many(ns, m)
+        expected = [fib(int(n), mode="fast_doubling") % m for n in ns]
+        if [int(g) for g in got] != expected:
+            print(f"mismatch for m={m}")
+            all_ok = False
+    pairs = fib_mod_pairs(np.array([10, 10, 10**18]), np.array([7, 11, 10**9 + 7]))
+    expected = [55 % 7, 55 % 11, fib(10**18 % pisano_period(10**9 + 7), mode="fast_doubling") % (10**9 + 7)]
+    if [int(v) for v in pairs] != expected:
+        print("fib_mod_pairs mismatch")
+        all_ok = False
+    rng = np.random.default_rng(1)
+    ns, ms = rng.integers(0, 10**4, size=(2, 3000))
+    ms += 1
+    got = fib_mod_pairs(ns.reshape(60, 50), ms.reshape(60, 50)).ravel()
+    table = [fib(int(k), mode="fast_doubling") for k in range(10**4)]
+    if [int(v) for v in got] != [table[n] % int(m) for n, m in zip(ns, ms)]:
+        print("fib_mod_pairs mismatch on mixed moduli")
+        all_ok = False
+    for m in (10**9 + 7, MAX_VECTOR_MODULUS):  # split-table path
+        clear_caches()
+        big = rng.integers(0, 2**63, size=1 << _split_shift(pisano_period(m)), dtype=np.uint64)
+        fib_mod_many(big, m)
+        if m not in _SPLIT_TABLES:
+            print(f"split table not built for m={m}")
+            all_ok = False
+        got = fib_mod_many(big[:500], m)
+        if [int(g) for g in got] != [_fib_pair_mod(int(n), m)[0] for n in big[:500]]:
+            print(f"split-table mismatch for m={m}")
+            all_ok = False
+    if fib_mod_many([], 10).size or fib_mod_pairs([], []).size:
+        print("empty batch mismatch")
+        all_ok = False
+    print("All smoke tests passed." if all_ok else "One or more smoke tests failed.")
+
+
+def _run_benchmarks():
+    """Report queries per second for one million random 64-bit indices."""
+    rng = np.random.default_rng(0)
+    indices = rng.integers(0, 2**63, size=10**6, dtype=np.uint64)
+    for m in (1000, 10**9 + 7):
+        fib_mod_many(indices[:1], m)  # exclude one-off period/table setup
+        start = time.perf_counter()
+        fib_mod_many(indices, m)
+        elapsed = time.perf_counter() - start
+        print(f"m={m}: {indices.size / elapsed / 1e6:.2f} M queries/s "
+              f"(pisano period {pisano_period(m)})")
+
+    # Paired arrays where nearly every modulus is distinct
+    for distinct in (200, 10**5):
+        clear_caches()
+        moduli = rng.integers(200_000, 350_000, size=distinct)
+        pair_moduli = moduli[rng.integers(0, distinct, size=indices.size)]
+        start = time.perf_counter()
+        fib_mod_pairs(indices, pair_moduli)
+        elapsed = time.perf_counter() - start
+        cached = sum(t.nbytes for t in _RESIDUE_TABLES.values()) / 2**20
+        print(f"pairs, {distinct:,} distinct moduli: {indices.size / elapsed / 1e6:.2f} M queries/s "
+              f"({cached:.0f} MiB of tables cached)")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if "--bench" in sys.argv[1:]:
+        _run_benchmarks()
+    else:
+        _run_smoke_tests()
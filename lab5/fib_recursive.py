@@ -4,17 +4,34 @@ A simple, well-documented recursive Fibonacci implementation for demonstration a
 
 Usage:
     python fib_recursive.py
-    # or import fib from this module and call fib(n)
+    python fib_recursive.py --bench   # compare the backends
+    python fib_recursive.py --save N PATH [dec|hex|bin]   # write F(N) to a file
+    # or import fib from this module and call fib(n) / fib(n, mode="fast_doubling")
 
 Notes:
 - This recursive implementation is intentionally simple to show recursion and base cases.
-- It's not efficient for large n; see the explanation document for improvements.
+- It's not efficient for large n; pass mode="fast_doubling" (or "matrix") for an
+  O(log n) backend that never recurses, or mode="memo" for a bottom-up cached table.
 """
-from typing import Union
+import os
+import sys
+import time
+from typing import List, Tuple
 
+# Backends understood by fib(n, mode=...).
+FIB_MODES = ("naive", "memo", "fast_doubling", "matrix")
 
-def fib(n: int) -> int:
-    """Return the n-th Fibonacci number using simple recursion.
+# Largest index whose value mode="memo" keeps in its table; values above it
+# are computed from the top of the table without being stored.
+MEMO_MAX_INDEX = 10_000
+
+# Bottom-up cache used by mode="memo"; grows to the largest index requested,
+# up to MEMO_MAX_INDEX. Emptied by clear_memo().
+_MEMO: List[int] = [0, 1]
+
+
+def fib(n: int, mode: str = "naive") -> int:
+    """Return the n-th Fibonacci number (by simple recursion in the default "naive" mode).
 
     The Fibonacci sequence is defined as:
         F(0) = 0
@@ -23,14 +40,17 @@ def fib(n: int) -> int:
 
     Args:
         n: Non-negative integer index into the Fibonacci sequence.
+        mode: Backend to use, one of FIB_MODES. The default "naive" is the
+            plain recursion below; "fast_doubling" and "matrix" take
+            O(log n) big-integer multiplications, "memo" reuses a cached table.
 
     Returns:
         The n-th Fibonacci number as an integer.
 
     Raises:
-        ValueError: If n is not an integer or is negative.
+        ValueError: If n is not an integer or is negative, or mode is unknown.
 
-    Complexity:
+    Complexity (default "naive" mode):
         Time: O(2^n) (exponential) — many overlapping subproblems.
         Space: O(n) recursion depth (call stack).
     """
@@ -40,6 +60,15 @@ def fib(n: int) -> int:
     if n < 0:
         raise ValueError("n must be a non-negative integer")
 
+    if mode != "naive":
+        if mode == "fast_doubling":
+            return fib_pair(n)[0]
+        if mode == "matrix":
+            return _fib_matrix(n)
+        if mode == "memo":
+            return _fib_memo(n)
+        raise ValueError(f"unknown mode {mode!r}; expected one of {FIB_MODES}")
+
     # Base cases
     if n == 0:
         # F(0) = 0
@@ -53,6 +82,90 @@ def fib(n: int) -> int:
     return fib(n - 1) + fib(n - 2)
 
 
+def fib_pair(n: int) -> Tuple[int, int]:
+    """Return (F(n), F(n+1)) using iterative fast doubling.
+
+    Walks the bits of n from the most significant end, applying
+        F(2k)   = F(k) * (2*F(k+1) - F(k))
+        F(2k+1) = F(k)^2 + F(k+1)^2
+    so only O(log n) big-integer multiplications are needed and there is
+    no recursion at all. Callers are expected to validate n themselves.
+    """
+    a, b = 0, 1  # (F(0), F(1))
+    for bit in bin(n)[2:]:
+        c = a * ((b << 1) - a)
+        d = a * a + b * b
+        if bit == "1":
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a, b
+
+
+def _fib_matrix(n: int) -> int:
+    """Return F(n) by raising [[1, 1], [1, 0]] to the n-th power.
+
+    The matrix powers are always of the form [[F(k+1), F(k)], [F(k), F(k-1)]],
+    so only the pair (F(k), F(k-1)) is tracked during square-and-multiply.
+    """
+    # result = identity = (F(0), F(-1)) = (0, 1); base = M = (F(1), F(0))
+    r_k, r_km1 = 0, 1
+    b_k, b_km1 = 1, 0
+    while n:
+        if n & 1:
+            shared = r_k * b_k
+            r_k, r_km1 = (
+                shared + r_k * b_km1 + r_km1 * b_k,
+                shared + r_km1 * b_km1,
+            )
+        sq = b_k * b_k
+        b_k, b_km1 = sq + 2 * b_k * b_km1, sq + b_km1 * b_km1
+        n >>= 1
+    return r_k
+
+
+def _fib_memo(n: int) -> int:
+    """Return F(n) from the module cache, extending it bottom-up if needed.
+
+    Avoids recursion entirely. The table stops growing at MEMO_MAX_INDEX
+    (a few megabytes, since memory grows roughly as n^2 bits); larger n
+    keep iterating from its last two entries without storing the values.
+    """
+    memo = _MEMO
+    while len(memo) <= min(n, MEMO_MAX_INDEX):
+        memo.append(memo[-1] + memo[-2])
+    if n < len(memo):
+        return memo[n]
+    a, b = memo[-2], memo[-1]
+    for _ in range(n - len(memo) + 1):
+        a, b = b, a + b
+    return b
+
+
+def clear_memo() -> None:
+    """Release the values cached by mode="memo"."""
+    del _MEMO[2:]
+
+
+def save_fib(n: int, path: str, base: str = "dec") -> int:
+    """Compute F(n) with fast doubling and write it to `path`.
+
+    Rendering goes through the shared bigint_format module at the repository
+    root, which avoids CPython's quadratic (and, since 3.11, size-limited)
+    int -> str conversion and writes the digits in chunks.
+
+    Returns:
+        The number of characters written.
+    """
+    try:
+        from bigint_format import write_int
+    except ImportError:
+        # Running from inside lab5/: make the repository root importable.
+        sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        from bigint_format import write_int
+    return write_int(fib(n, mode="fast_doubling"), path, base=base)
+
+
 def _run_smoke_tests():
     """Run a few smoke tests to verify correctness for small n."""
     test_values = list(range(0, 11))  # 0..10
@@ -64,6 +177,10 @@ def _run_smoke_tests():
         print(f"fib({tv}) = {got} (expected {exp})")
         if got != exp:
             all_ok = False
+        for mode in FIB_MODES[1:]:
+            if fib(tv, mode=mode) != exp:
+                print(f"fib({tv}, mode={mode!r}) disagrees (expected {exp})")
+                all_ok = False
 
     if all_ok:
         print("All smoke tests passed.")
@@ -71,7 +188,43 @@ def _run_smoke_tests():
         print("One or more smoke tests failed.")
 
 
+def _run_benchmarks():
+    """Time each backend at n = 30, 10**4 and 10**6.
+
+    The naive recursion is exponential, so it is reported as skipped beyond
+    n = 35 rather than attempted.
+    """
+    sizes = (30, 10**4, 10**6)
+    limits = {"naive": 35}
+    reference = {n: fib_pair(n)[0] for n in sizes}
+
+    print(f"{'mode':<15}" + "".join(f"{'n=' + str(n):>16}" for n in sizes))
+    for mode in FIB_MODES:
+        row = f"{mode:<15}"
+        for n in sizes:
+            if n > limits.get(mode, n):
+                row += f"{'skipped':>16}"
+                continue
+            clear_memo()  # time memo from a cold cache
+            start = time.perf_counter()
+            value = fib(n, mode=mode)
+            elapsed = time.perf_counter() - start
+            assert value == reference[n], f"{mode} disagrees at n={n}"
+            row += f"{elapsed * 1e3:>13.3f} ms"
+        print(row)
+    clear_memo()
+
+
 if __name__ == "__main__":
+    if "--bench" in sys.argv[1:]:
+        _run_benchmarks()
+        sys.exit(0)
+    if sys.argv[1:2] == ["--save"]:
+        n_arg, path_arg, *base_arg = sys.argv[2:]
+        count = save_fib(int(n_arg), path_arg, *base_arg)
+        print(f"Wrote {count} characters of F({n_arg}) to {path_arg}")
+        sys.exit(0)
+
     # When run as a script, execute smoke tests and show a short example
     print("Running smoke tests for recursive Fibonacci implementation...")
     _run_smoke_tests()
@@ -0,0 +1,113 @@
+import mmap
+import struct
+
+from prime_sieve import SEGMENT_BLOCKS, WHEEL, sieve_segment, primes_up_to
+
+# File layout: header, then one byte per block of 30 integers in which bit j
+# is set when base + WHEEL[j] is prime. 2**32 needs 143,165,577 bytes
+# (about 136 MiB) instead of 512 MiB for a plain bit per integer.
+_MAGIC = b"PBMP"
+_HEADER = struct.Struct("<4sIQ")  # magic, version, limit
+_VERSION = 1
+
+DEFAULT_LIMIT = 1 << 32
+
+# Bit position of each residue mod 30 in a block byte, or -1 off the wheel.
+_BIT_OF_RESIDUE = [-1] * 30
+for _j, _spoke in enumerate(WHEEL):
+	_BIT_OF_RESIDUE[_spoke] = _j
+
+
+def _pack_segment(segment: bytearray) -> bytes:
+	"""Fold 8 flag bytes per block into one byte with 8 flag bits.
+
+	Each spoke plane segment[j::8] holds 0/1 bytes, so shifting its integer
+	value left by j moves every flag to bit j of its own byte without any
+	carries, and OR-ing the 8 planes packs the block.
+	"""
+	blocks = len(segment) // 8
+	packed = 0
+	for j in range(8):
+		packed |= int.from_bytes(segment[j::8], "little") << j
+	return packed.to_bytes(blocks, "little")
+
+
+def build(path: str, limit: int = DEFAULT_LIMIT) -> None:
+	"""Sieve every integer below `limit` and write the packed bitmap to `path`.
+
+	Works one prime_sieve segment at a time, so peak memory is a couple of
+	MiB regardless of the limit.
+	"""
+	if limit <= 0:
+		raise ValueError("limit must be a positive integer")
+	blocks_total = -(-limit // 30)
+	primes = primes_up_to(int((30 * blocks_total) ** 0.5) + 1)[3:]
+	with open(path, "wb") as handle:
+		handle.write(_HEADER.pack(_MAGIC, _VERSION, limit))
+		for first_block in range(0, blocks_total, SEGMENT_BLOCKS):
+			blocks = min(SEGMENT_BLOCKS, blocks_total - first_block)
+			segment = sieve_segment(30 * first_block, blocks, primes)
+			handle.write(_pack_segment(segment))
+
+
+class PrimeBitmap:
+	"""Read-only, memory-mapped view of a bitmap written by build().
+
+	Opening only maps the file; pages are read from disk (or shared from the
+	page cache with other processes) the first time a lookup touches them.
+	"""
+
+	def __init__(self, path: str):
+		with open(path, "rb") as handle:
+			self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+		magic, version, limit = _HEADER.unpack_from(self._map)
+		if magic != _MAGIC or version != _VERSION or len(self._map) != _HEADER.size + -(-limit // 30):
+			self._map.close()
+			raise ValueError(f"{path} is not a version {_VERSION} prime bitmap")
+		self.limit = limit
+
+	def __contains__(self, n: int) -> bool:
+		return self.is_prime(n)
+
+	def is_prime(self, n: int) -> bool:
+		"""Return whether 0 <= n < limit is prime in O(1).
+
+		Raises ValueError for n outside the bitmap range.
+		"""
+		if not 0 <= n < self.limit:
+			raise ValueError(f"{n} is outside the bitmap range [0, {self.limit})")
+		if n < 6:
+			return n in (2, 3, 5)
+		block, residue = divmod(n, 30)
+		bit = _BIT_OF_RESIDUE[residue]
+		return bit >= 0 and (self._map[_HEADER.size + block] >> bit) & 1 == 1
+
+	def close(self) -> None:
+		self._map.close()
+
+
+if __name__ == "__main__":
+	import os
+	import sys
+	import tempfile
+	import time
+
+	if sys.argv[1:2] == ["build"]:
+		# python prime_bitmap.py build PATH [LIMIT]
+		target = sys.argv[2]
+		limit = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_LIMIT
+		start = time.perf_counter()
+		build(target, limit)
+		print(f"Wrote {os.path.getsize(target):,} bytes to {target} in {time.perf_counter() - start:.1f} s")
+		sys.exit(0)
+
+	# Quick checks against a plain sieve
+	path = os.path.join(tempfile.mkdtemp(), "primes.bmp")
+	for limit in (1, 31, 10_007, 5_000_000):
+		build(path, limit)
+		bitmap = PrimeBitmap(path)
+		expected = set(primes_up_to(limit - 1))
+		assert all(bitmap.is_prime(k) == (k in expected) for k in range(limit)), f"mismatch below {limit}"
+		bitmap.close()
+	os.remove(path)
+	print("All prime_bitmap checks passed.")
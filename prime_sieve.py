@@ -0,0 +1,157 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress
+from math import isqrt
+from typing import Iterator, List, Optional, Sequence
+
+# Residues mod 30 that are coprime to 2, 3 and 5 (the wheel spokes). A
+# segment stores one byte per spoke per block of 30 integers, interleaved so
+# that byte 8*i + j stands for base + 30*i + WHEEL[j].
+WHEEL = (1, 7, 11, 13, 17, 19, 23, 29)
+
+# Blocks of 30 integers per segment: 8 bytes each, so 128 KiB blocks make a
+# 1 MiB bytearray, which sits comfortably in a typical L2 cache.
+SEGMENT_BLOCKS = 1 << 17
+
+# Shared all-zero buffer used to clear strided slices without allocating.
+_ZEROS = memoryview(bytes(8 * SEGMENT_BLOCKS))
+
+# Base primes for pool workers, installed once per process by _init_worker().
+_WORKER_PRIMES: List[int] = []
+
+
+def primes_up_to(n: int) -> List[int]:
+	"""Return all primes <= n using a bytearray sieve of Eratosthenes."""
+	if n < 2:
+		return []
+	sieve = bytearray([1]) * (n + 1)
+	sieve[0] = sieve[1] = 0
+	for p in range(2, isqrt(n) + 1):
+		if sieve[p]:
+			sieve[p * p::p] = bytes(len(range(p * p, n + 1, p)))
+	return [i for i, flag in enumerate(sieve) if flag]
+
+
+def sieve_segment(base: int, blocks: int, primes: Sequence[int]) -> bytearray:
+	"""Sieve the integers [base, base + 30 * blocks) coprime to 30.
+
+	`base` must be a multiple of 30 and `primes` the primes from 7 up to at
+	least sqrt(base + 30 * blocks). For each prime p and each spoke, the
+	multiples of p on that spoke are 30p apart, i.e. every p-th block, so a
+	single strided slice assignment clears them all.
+	"""
+	size = 8 * blocks
+	segment = bytearray([1]) * size
+	end = base + 30 * blocks
+	for p in primes:
+		if p * p >= end:
+			break
+		inverse = pow(p, -1, 30)
+		step = 8 * p
+		for j, spoke in enumerate(WHEEL):
+			# Smallest q >= max(p, ceil((base + spoke) / p)) with p*q on this spoke.
+			q = max(p, -(-(base + spoke) // p))
+			q += (spoke * inverse - q) % 30
+			multiple = p * q
+			if multiple >= end:
+				continue
+			start = 8 * ((multiple - base) // 30) + j
+			count = len(range(start, size, step))
+			segment[start::step] = _ZEROS[:count]
+	if base == 0:
+		segment[0] = 0  # 1 is not prime
+	return segment
+
+
+def _decode(base: int, segment: bytearray, lo: int, hi: int) -> Iterator[int]:
+	"""Yield the primes flagged in `segment` that fall inside [lo, hi]."""
+	for index in compress(range(len(segment)), segment):
+		value = base + 30 * (index >> 3) + WHEEL[index & 7]
+		if value > hi:
+			return
+		if value >= lo:
+			yield value
+
+
+def _init_worker(primes: List[int]) -> None:
+	global _WORKER_PRIMES
+	_WORKER_PRIMES = primes
+
+
+def _sieve_segment_in_worker(base: int, blocks: int) -> bytearray:
+	return sieve_segment(base, blocks, _WORKER_PRIMES)
+
+
+def primes_in_range(lo: int, hi: int, workers: Optional[int] = None) -> Iterator[int]:
+	"""Yield the primes p with lo <= p <= hi in increasing order.
+
+	A segmented sieve of Eratosthenes over a mod-30 wheel: only integers
+	coprime to 2, 3 and 5 are stored (8 bytes per 30 integers) and each
+	segment is a ~1 MiB bytearray, so memory stays bounded however wide the
+	range is. Base primes up to sqrt(hi) are sieved once up front.
+
+	Args:
+		lo: Lower bound (inclusive).
+		hi: Upper bound (inclusive).
+		workers: If greater than 1, segments are sieved on a process pool of
+			this size. At most 2 * workers segments are in flight at once,
+			so memory stays bounded while the caller consumes the primes.
+
+	Returns:
+		An iterator over the primes in [lo, hi].
+	"""
+	lo = max(lo, 2)
+	if hi < lo:
+		return
+	for small in (2, 3, 5):
+		if lo <= small <= hi:
+			yield small
+
+	primes = primes_up_to(isqrt(hi))[3:]  # the wheel already removes 2, 3, 5
+	bases = range((lo // 30) * 30, hi + 1, 30 * SEGMENT_BLOCKS)
+	if not workers or workers <= 1:
+		for base in bases:
+			yield from _decode(base, sieve_segment(base, SEGMENT_BLOCKS, primes), lo, hi)
+		return
+
+	with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(primes,)) as pool:
+		pending: deque = deque()
+		base_iter = iter(bases)
+		for base in base_iter:
+			pending.append((base, pool.submit(_sieve_segment_in_worker, base, SEGMENT_BLOCKS)))
+			if len(pending) >= 2 * workers:
+				break
+		while pending:
+			base, future = pending.popleft()
+			next_base = next(base_iter, None)
+			if next_base is not None:
+				pending.append((next_base, pool.submit(_sieve_segment_in_worker, next_base, SEGMENT_BLOCKS)))
+			yield from _decode(base, future.result(), lo, hi)
+
+
+def count_primes_in_range(lo: int, hi: int, workers: Optional[int] = None) -> int:
+	"""Return how many primes lie in [lo, hi] (see primes_in_range)."""
+	return sum(1 for _ in primes_in_range(lo, hi, workers))
+
+
+if __name__ == "__main__":
+	import sys
+	import time
+
+	from task2 import is_prime
+
+	# Quick checks against task2.is_prime
+	for lo, hi in ((0, 1), (0, 2), (2, 30), (0, 1000), (7, 7), (8, 10), (999_000, 1_001_000)):
+		expected = [k for k in range(lo, hi + 1) if is_prime(k)]
+		assert list(primes_in_range(lo, hi)) == expected, f"mismatch on [{lo}, {hi}]"
+	assert list(primes_in_range(0, 5_000_000)) == primes_up_to(5_000_000)
+	assert list(primes_in_range(10**6, 9 * 10**6, workers=2)) == [p for p in primes_up_to(9 * 10**6) if p >= 10**6]
+	print("All prime_sieve checks passed.")
+
+	if "--bench" in sys.argv[1:]:
+		lo = 10**12
+		hi = lo + 10**8
+		start = time.perf_counter()
+		count = count_primes_in_range(lo, hi, workers=os.cpu_count())
+		print(f"{count} primes in [10**12, 10**12 + 10**8] in {time.perf_counter() - start:.2f} s")
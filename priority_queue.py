@@ -0,0 +1,221 @@
+"""
+priority_queue.py
+Indexed binary-heap priority queue with the Question2 Queue method names.
+
+Lower priority values come out first, and items of equal priority come out
+in the order they were enqueued (each entry is keyed by (priority, sequence
+number)). A dict from item to heap position makes update_priority() and
+remove() O(log n) instead of an O(n) scan; in exchange items must be
+hashable and can be queued only once at a time.
+
+Usage:
+    pq = PriorityQueue()
+    pq.enqueue("backup", 5)
+    pq.enqueue("alert", 1)
+    pq.update_priority("backup", 0)
+    pq.dequeue()   # "backup"
+
+    python priority_queue.py --bench   # compare against re-sorting a list
+"""
+from itertools import count
+from typing import Any, Dict, Hashable, List, Tuple
+
+
+class PriorityQueue:
+    """Min-priority queue with O(log n) update_priority() and remove()."""
+
+    def __init__(self):
+        self._keys: List[Tuple[Any, int]] = []  # (priority, sequence) per heap slot
+        self._items: List[Hashable] = []
+        self._index: Dict[Hashable, int] = {}  # item -> heap slot
+        self._sequence = count()
+
+    # ---- heap maintenance -----------------------------------------------
+
+    def _place(self, position: int, key, item) -> None:
+        self._keys[position] = key
+        self._items[position] = item
+        self._index[item] = position
+
+    def _sift_up(self, position: int) -> None:
+        keys, items = self._keys, self._items
+        key, item = keys[position], items[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            if not key < keys[parent]:
+                break
+            self._place(position, keys[parent], items[parent])
+            position = parent
+        self._place(position, key, item)
+
+    def _sift_down(self, position: int) -> None:
+        keys, items = self._keys, self._items
+        size = len(keys)
+        key, item = keys[position], items[position]
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and keys[child + 1] < keys[child]:
+                child += 1
+            if not keys[child] < key:
+                break
+            self._place(position, keys[child], items[child])
+            position = child
+        self._place(position, key, item)
+
+    def _pop_at(self, position: int):
+        """Remove and return the entry at a heap slot, keeping the heap valid."""
+        keys, items = self._keys, self._items
+        key, item = keys[position], items[position]
+        del self._index[item]
+        last_key, last_item = keys.pop(), items.pop()
+        if position < len(keys):
+            self._place(position, last_key, last_item)
+            if position > 0 and last_key < keys[(position - 1) >> 1]:
+                self._sift_up(position)
+            else:
+                self._sift_down(position)
+        return key[0], item
+
+    # ---- Queue API --------------------------------------------------------
+
+    def enqueue(self, item: Hashable, priority=0) -> None:
+        if item in self._index:
+            raise ValueError(f"{item!r} is already queued; use update_priority()")
+        self._keys.append((priority, next(self._sequence)))
+        self._items.append(item)
+        self._index[item] = len(self._items) - 1
+        self._sift_up(len(self._items) - 1)
+
+    def dequeue(self):
+        if self.is_empty():
+            return "Queue is empty. Cannot dequeue."
+        return self._pop_at(0)[1]
+
+    def dequeue_with_priority(self):
+        """Like dequeue(), but return (priority, item)."""
+        if self.is_empty():
+            return "Queue is empty. Cannot dequeue."
+        return self._pop_at(0)
+
+    def peek(self):
+        if self.is_empty():
+            return "Queue is empty. Nothing to peek."
+        return self._items[0]
+
+    def update_priority(self, item: Hashable, priority) -> None:
+        """Change the priority of a queued item in O(log n).
+
+        The item moves behind any items already queued with the new
+        priority, as if it had just been enqueued with it.
+        """
+        position = self._index[item]
+        old = self._keys[position]
+        new = (priority, next(self._sequence))
+        self._keys[position] = new
+        if new < old:
+            self._sift_up(position)
+        else:
+            self._sift_down(position)
+
+    def remove(self, item: Hashable) -> None:
+        """Remove a queued item in O(log n); raises KeyError if absent."""
+        self._pop_at(self._index[item])
+
+    def priority(self, item: Hashable):
+        """Return the current priority of a queued item."""
+        return self._keys[self._index[item]][0]
+
+    def is_empty(self) -> bool:
+        return len(self._items) == 0
+
+    def size(self) -> int:
+        return len(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item) -> bool:
+        return item in self._index
+
+
+def _run_benchmark(n: int = 20_000, updates: int = 20_000) -> None:
+    """Random priority changes followed by draining, vs. a re-sorted list."""
+    import random
+    import time
+
+    rng = random.Random(1)
+    priorities = [rng.random() for _ in range(n)]
+    changes = [(rng.randrange(n), rng.random()) for _ in range(updates)]
+
+    start = time.perf_counter()
+    pq = PriorityQueue()
+    for item, priority in enumerate(priorities):
+        pq.enqueue(item, priority)
+    for item, priority in changes:
+        pq.update_priority(item, priority)
+    heap_order = [pq.dequeue() for _ in range(n)]
+    heap_time = time.perf_counter() - start
+
+    # The list keeps (priority, sequence, item) sorted; every change re-sorts it.
+    start = time.perf_counter()
+    entries = [(priority, seq, item) for seq, (item, priority) in enumerate(zip(range(n), priorities))]
+    entries.sort()
+    seq = n
+    for item, priority in changes:
+        position = next(i for i, entry in enumerate(entries) if entry[2] == item)
+        entries[position] = (priority, seq, item)
+        seq += 1
+        entries.sort()
+    list_order = [entry[2] for entry in entries]
+    list_time = time.perf_counter() - start
+
+    assert heap_order == list_order
+    print(f"n={n:,} items, {updates:,} update_priority calls, then drain")
+    print(f"  indexed heap   {heap_time:8.3f} s")
+    print(f"  re-sorted list {list_time:8.3f} s  ({list_time / heap_time:.0f}x slower)")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if "--bench" in sys.argv[1:]:
+        _run_benchmark()
+        sys.exit(0)
+
+    # Quick checks
+    import random
+
+    pq = PriorityQueue()
+    for name in ("a", "b", "c", "d"):
+        pq.enqueue(name, 1)
+    pq.enqueue("urgent", 0)
+    assert pq.peek() == "urgent" and pq.size() == 5
+    pq.update_priority("a", 1)  # re-queued behind b, c, d
+    pq.remove("c")
+    assert "c" not in pq and "d" in pq
+    assert [pq.dequeue() for _ in range(4)] == ["urgent", "b", "d", "a"]
+    assert pq.dequeue() == "Queue is empty. Cannot dequeue."
+
+    rng = random.Random(7)
+    pq = PriorityQueue()
+    reference = {}
+    for step in range(5000):
+        item = rng.randrange(300)
+        action = rng.random()
+        if item not in reference:
+            reference[item] = rng.randrange(50)
+            pq.enqueue(item, reference[item])
+        elif action < 0.5:
+            reference[item] = rng.randrange(50)
+            pq.update_priority(item, reference[item])
+        else:
+            del reference[item]
+            pq.remove(item)
+        assert pq.size() == len(reference)
+        if reference:
+            assert pq.priority(pq.peek()) == min(reference.values())
+    drained = [pq.dequeue_with_priority()[0] for _ in range(pq.size())]
+    assert drained == sorted(reference.values())
+    print("All priority_queue checks passed.")
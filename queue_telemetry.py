@@ -0,0 +1,376 @@
+"""
+queue_telemetry.py
+Opt-in telemetry for the deque-backed Queue classes (Question2 and Assignment 11/L11 T2).
+
+attach(q) replaces enqueue/enqueue_many/dequeue/dequeue_many on that one
+instance with recording wrappers; detach() puts the class methods back.
+Queues that were never attached run the plain class code, so telemetry costs
+nothing when it is off.
+
+While attached it tracks:
+    - current and peak depth, and rejected enqueues (items turned away
+      because the queue was full; for enqueue_many() only sized batches
+      such as lists are counted, since the items an iterator still holds
+      are left to the caller)
+    - enqueue/dequeue counts and rates (per second, since the last snapshot)
+    - per-item wait time from enqueue to dequeue, in a log-linear
+      (HDR-style) histogram with ~3% relative precision
+    - time spent empty and, for bounded queues, time spent full
+
+Wait times rely on FIFO order: enqueue timestamps are kept in a deque that
+is popped in step with the queue. Items already queued when attach() runs
+are not timed.
+
+Usage:
+    from Question2 import Queue
+    from queue_telemetry import attach
+
+    q = Queue(capacity=1000)
+    telemetry = attach(q)
+    ...
+    print(telemetry.format_snapshot())
+    telemetry.export_json("queue_stats.json")
+    telemetry.detach()
+"""
+import json
+import time
+from collections import deque
+from collections.abc import Sized
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Each power-of-two range of the histogram is split into this many buckets
+# (2**5 = 32), so a recorded value is off by at most 1/32 of itself.
+SUB_BUCKET_BITS = 5
+
+_PATCHED = ("enqueue", "enqueue_many", "dequeue", "dequeue_many")
+
+
+class Histogram:
+    """Log-linear histogram of non-negative integers (e.g. nanoseconds).
+
+    Values below 2 * 2**SUB_BUCKET_BITS get exact buckets; above that each
+    power of two is divided into 2**SUB_BUCKET_BITS equal buckets, as in
+    HdrHistogram. Memory is a few hundred counters for the full 64-bit range.
+    """
+
+    def __init__(self):
+        self.counts: List[int] = []
+        self.total = 0
+        self.sum = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    @staticmethod
+    def bucket_index(value: int) -> int:
+        sub = 1 << SUB_BUCKET_BITS
+        if value < 2 * sub:
+            return value
+        shift = value.bit_length() - SUB_BUCKET_BITS - 1
+        return sub * (shift + 1) + (value >> shift) - sub
+
+    @staticmethod
+    def bucket_low(index: int) -> int:
+        """Smallest value that falls into bucket `index`."""
+        sub = 1 << SUB_BUCKET_BITS
+        if index < 2 * sub:
+            return index
+        shift = index // sub - 1
+        return (index % sub + sub) << shift
+
+    def record(self, value: int) -> None:
+        index = self.bucket_index(value)
+        counts = self.counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+        self.total += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> Optional[int]:
+        """Lower bound of the bucket holding the q-th percentile (0 <= q <= 100)."""
+        if not self.total:
+            return None
+        rank = max(1, -(-self.total * q // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return max(self.bucket_low(index), self.min)
+        return self.max
+
+    def buckets(self) -> List[Tuple[int, int]]:
+        """Non-empty buckets as (lower bound, count) pairs."""
+        return [(self.bucket_low(index), count) for index, count in enumerate(self.counts) if count]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.total,
+            "min": self.min,
+            "mean": self.sum / self.total if self.total else None,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+            "max": self.max,
+        }
+
+
+class QueueTelemetry:
+    """Counters for one Queue instance; created by attach()."""
+
+    def __init__(self, queue, clock: Callable[[], int] = time.perf_counter_ns):
+        self.queue = queue
+        self.clock = clock
+        self.enqueued = 0
+        self.dequeued = 0
+        self.rejected = 0
+        self.peak_depth = len(queue.items)
+        self.wait_ns = Histogram()
+        self.empty_ns = 0
+        self.full_ns = 0
+        now = clock()
+        self._stamps: deque = deque([None] * len(queue.items))  # untimed items
+        self._state = self._current_state()
+        self._state_since = now
+        self._last_snapshot = (now, 0, 0)
+        self.attached = False
+
+    def _current_state(self) -> str:
+        depth = len(self.queue.items)
+        if depth == 0:
+            return "empty"
+        capacity = self.queue.capacity
+        if capacity is not None and depth >= capacity:
+            return "full"
+        return "busy"
+
+    def _transition(self, now: int) -> None:
+        state = self._current_state()
+        if state != self._state:
+            if self._state == "empty":
+                self.empty_ns += now - self._state_since
+            elif self._state == "full":
+                self.full_ns += now - self._state_since
+            self._state = state
+            self._state_since = now
+
+    def _after_enqueue(self, added: int, rejected: int = 0) -> None:
+        self.rejected += rejected
+        if not added:
+            return
+        now = self.clock()
+        if added == 1:
+            self._stamps.append(now)
+        else:
+            self._stamps.extend([now] * added)
+        self.enqueued += added
+        depth = len(self.queue.items)
+        if depth > self.peak_depth:
+            self.peak_depth = depth
+        if depth == added or self._state == "full" or depth == self.queue.capacity:
+            self._transition(now)
+
+    def _after_dequeue(self, removed: int) -> None:
+        if not removed:
+            return
+        now = self.clock()
+        popleft, record = self._stamps.popleft, self.wait_ns.record
+        for _ in range(removed):
+            stamp = popleft()
+            if stamp is not None:
+                record(now - stamp)
+        self.dequeued += removed
+        if self._state != "busy" or not self.queue.items:
+            self._transition(now)
+
+    def attach(self) -> "QueueTelemetry":
+        """Install the recording wrappers on the queue instance."""
+        if self.attached:
+            return self
+        queue = self.queue
+        items = queue.items
+        cls = type(queue)
+        enqueue, enqueue_many = cls.enqueue.__get__(queue), cls.enqueue_many.__get__(queue)
+        dequeue, dequeue_many = cls.dequeue.__get__(queue), cls.dequeue_many.__get__(queue)
+
+        def recording_enqueue(item):
+            before = len(items)
+            result = enqueue(item)
+            added = len(items) - before
+            full = queue.capacity is not None and before >= queue.capacity
+            self._after_enqueue(added, 1 if not added and full else 0)
+            return result
+
+        def recording_enqueue_many(batch):
+            added = enqueue_many(batch)
+            self._after_enqueue(added, len(batch) - added if isinstance(batch, Sized) else 0)
+            return added
+
+        def recording_dequeue():
+            before = len(items)
+            result = dequeue()
+            self._after_dequeue(before - len(items))
+            return result
+
+        def recording_dequeue_many(count):
+            batch = dequeue_many(count)
+            self._after_dequeue(len(batch))
+            return batch
+
+        queue.enqueue = recording_enqueue
+        queue.enqueue_many = recording_enqueue_many
+        queue.dequeue = recording_dequeue
+        queue.dequeue_many = recording_dequeue_many
+        queue._telemetry = self
+        self.attached = True
+        return self
+
+    def detach(self) -> None:
+        """Restore the plain class methods; the counters are kept."""
+        if not self.attached:
+            return
+        for name in _PATCHED:
+            self.queue.__dict__.pop(name, None)
+        self.queue.__dict__.pop("_telemetry", None)
+        self.attached = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current counters as a JSON-serialisable dict.
+
+        Rates cover the interval since the previous snapshot (or attach).
+        """
+        now = self.clock()
+        last_time, last_enqueued, last_dequeued = self._last_snapshot
+        interval = max(now - last_time, 1) / 1e9
+        self._last_snapshot = (now, self.enqueued, self.dequeued)
+        open_ns = now - self._state_since
+        return {
+            "depth": len(self.queue.items),
+            "peak_depth": self.peak_depth,
+            "capacity": self.queue.capacity,
+            "enqueued": self.enqueued,
+            "dequeued": self.dequeued,
+            "rejected": self.rejected,
+            "enqueue_rate": (self.enqueued - last_enqueued) / interval,
+            "dequeue_rate": (self.dequeued - last_dequeued) / interval,
+            "wait_ns": self.wait_ns.as_dict(),
+            "empty_s": (self.empty_ns + (open_ns if self._state == "empty" else 0)) / 1e9,
+            "full_s": (self.full_ns + (open_ns if self._state == "full" else 0)) / 1e9,
+        }
+
+    def format_snapshot(self) -> str:
+        """Return snapshot() as a few lines of plain text."""
+        data = self.snapshot()
+        wait = data["wait_ns"]
+        lines = [
+            f"depth {data['depth']} (peak {data['peak_depth']}, capacity {data['capacity']})",
+            f"enqueued {data['enqueued']} ({data['enqueue_rate']:,.0f}/s), "
+            f"dequeued {data['dequeued']} ({data['dequeue_rate']:,.0f}/s), rejected {data['rejected']}",
+            f"time empty {data['empty_s']:.3f} s, time full {data['full_s']:.3f} s",
+        ]
+        if wait["count"]:
+            lines.append(
+                "wait us: "
+                + ", ".join(f"{key} {wait[key] / 1e3:.1f}" for key in ("min", "p50", "p90", "p99", "p999", "max"))
+            )
+        return "\n".join(lines)
+
+    def export_json(self, path: str) -> None:
+        """Write snapshot() plus the raw wait-time buckets to `path` as JSON."""
+        data = self.snapshot()
+        data["wait_ns"]["buckets"] = self.wait_ns.buckets()
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=2)
+
+
+def attach(queue, clock: Callable[[], int] = time.perf_counter_ns) -> QueueTelemetry:
+    """Start recording telemetry for `queue`; returns its QueueTelemetry."""
+    existing = queue.__dict__.get("_telemetry")
+    if existing is not None:
+        return existing
+    return QueueTelemetry(queue, clock).attach()
+
+
+def telemetry_of(queue) -> Optional[QueueTelemetry]:
+    """Return the QueueTelemetry attached to `queue`, or None."""
+    return queue.__dict__.get("_telemetry")
+
+
+def _run_benchmark(n: int = 10**6) -> None:
+    """Per-operation cost of a plain queue vs. one with telemetry attached."""
+    from Question2 import Queue
+
+    for label, enabled in (("telemetry off", False), ("telemetry on", True)):
+        q = Queue()
+        if enabled:
+            attach(q)
+        start = time.perf_counter()
+        for i in range(n):
+            q.enqueue(i)
+        for _ in range(n):
+            q.dequeue()
+        elapsed = time.perf_counter() - start
+        print(f"{label:<14} {elapsed / (2 * n) * 1e9:6.0f} ns/op")
+
+
+if __name__ == "__main__":
+    import importlib.util
+    import os
+    import sys
+
+    from Question2 import Queue
+
+    if "--bench" in sys.argv[1:]:
+        _run_benchmark()
+        sys.exit(0)
+
+    # Quick checks with a fake clock (1 tick = 1 ns)
+    ticks = [0]
+
+    def fake_clock():
+        return ticks[0]
+
+    q = Queue(capacity=3)
+    q.enqueue("untimed")
+    telemetry = attach(q, clock=fake_clock)
+    assert attach(q) is telemetry and telemetry_of(q) is telemetry
+    ticks[0] = 100
+    assert q.enqueue_many(["a", "b", "c"]) == 2  # now full; "c" is rejected
+    ticks[0] = 400
+    assert q.enqueue("d") == "Queue is full. Cannot enqueue."
+    assert q.dequeue() == "untimed"
+    ticks[0] = 1000
+    assert q.dequeue_many(5) == ["a", "b"]  # empty from here
+    ticks[0] = 1500
+    snap = telemetry.snapshot()
+    assert (snap["enqueued"], snap["dequeued"], snap["rejected"], snap["peak_depth"]) == (2, 3, 2, 3)
+    assert snap["wait_ns"]["count"] == 2 and snap["wait_ns"]["min"] == 900
+    assert snap["full_s"] == 300 / 1e9 and snap["empty_s"] == 500 / 1e9
+    assert q.enqueue_many([]) == 0 and q.enqueue_many(iter(["e"])) == 1
+    assert telemetry.rejected == 2  # an empty batch is not a rejection
+    telemetry.detach()
+    assert "enqueue" not in q.__dict__ and telemetry_of(q) is None
+
+    hist = Histogram()
+    for value in range(1, 100_001):
+        hist.record(value)
+    for q_, exact in ((50, 50_000), (99, 99_000)):
+        assert abs(hist.percentile(q_) - exact) <= exact / 2**SUB_BUCKET_BITS
+    for index in range(2000):
+        assert Histogram.bucket_index(Histogram.bucket_low(index)) == index
+
+    # The L11 T2 queue prints instead of returning messages; same wrappers apply.
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Assignment 11", "L11 T2.py")
+    spec = importlib.util.spec_from_file_location("L11_T2", path)
+    l11 = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(l11)
+    q2 = l11.Queue()
+    telemetry = attach(q2)
+    q2.enqueue(1)
+    q2.dequeue()
+    assert telemetry.snapshot()["wait_ns"]["count"] == 1
+    print("All queue_telemetry checks passed.")
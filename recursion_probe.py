@@ -0,0 +1,265 @@
+"""
+recursion_probe.py
+Instrumentation and optional memoisation for the repository's recursive helpers.
+
+Wraps a recursive function so that every call (including the recursive ones)
+is counted, the deepest nesting is recorded, wall time is measured per
+top-level invocation, and RecursionErrors are tallied. A bounded LRU memo
+cache can be switched on per function, with hit/miss counts.
+
+Because the recursive helpers call themselves through a module global
+(fib, factorial_recursive, factorial) or a class attribute (BST._insert, ...),
+patching that name with patch() routes the recursion through the wrapper
+without editing the original files. Each wrapped call adds one interpreter
+frame, so an instrumented function hits the recursion limit at roughly half
+the depth it otherwise would.
+
+Usage:
+    from recursion_probe import instrument, load_script, patch, format_report
+
+    @instrument(memo=True, maxsize=256)
+    def fib(n): ...
+
+    task4 = load_script("task.4.py")
+    patch(task4, "factorial_recursive")
+    task4.factorial_recursive(300)
+    print(format_report())
+
+    python recursion_probe.py   # instrument every helper in the repo and report
+"""
+import functools
+import importlib.util
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+
+class CallStats:
+    """Counters collected for one instrumented function."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.invocations = 0  # top-level (non-nested) calls
+        self.max_depth = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.wall_time = 0.0
+        self.recursion_errors = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "invocations": self.invocations,
+            "calls_per_invocation": self.calls / self.invocations if self.invocations else 0.0,
+            "max_depth": self.max_depth,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_ratio": self.cache_hits / lookups if lookups else None,
+            "wall_time_s": self.wall_time,
+            "recursion_errors": self.recursion_errors,
+        }
+
+
+# Every CallStats created by instrument(), keyed by function name.
+REGISTRY: Dict[str, CallStats] = {}
+
+
+def instrument(
+    func: Optional[Callable] = None,
+    *,
+    name: Optional[str] = None,
+    memo: bool = False,
+    maxsize: int = 1024,
+    registry: Optional[Dict[str, CallStats]] = None,
+) -> Callable:
+    """Decorate a (recursive) function with call, depth and timing counters.
+
+    Args:
+        func: The function to wrap (omit to use as @instrument(...)).
+        name: Report name (default: the function's __qualname__).
+        memo: If True, results are cached in a bounded LRU keyed by the
+            call's arguments, which must then be hashable. Only turn this on
+            for pure functions; methods with side effects (BST._insert)
+            would silently skip work.
+        maxsize: Maximum number of memoised results kept.
+        registry: Where to record the CallStats (default: REGISTRY).
+
+    Returns:
+        The wrapped function; its counters are available as `.stats`.
+    """
+    if func is None:
+        return functools.partial(instrument, name=name, memo=memo, maxsize=maxsize, registry=registry)
+
+    stats = CallStats(name or func.__qualname__)
+    (REGISTRY if registry is None else registry)[stats.name] = stats
+    local = threading.local()
+    cache: "OrderedDict[Any, Any]" = OrderedDict()
+    # Guards the counters and the cache; func itself runs outside it, so
+    # recursive and concurrent calls never wait on each other's computation.
+    lock = threading.Lock()
+    missing = object()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        depth = getattr(local, "depth", 0) + 1
+        local.depth = depth
+        outermost = depth == 1
+        with lock:
+            stats.calls += 1
+            if depth > stats.max_depth:
+                stats.max_depth = depth
+            if outermost:
+                stats.invocations += 1
+        if outermost:
+            start = time.perf_counter()
+        try:
+            if not memo:
+                return func(*args, **kwargs)
+            key = (args, tuple(sorted(kwargs.items())))
+            with lock:
+                result = cache.get(key, missing)
+                if result is not missing:
+                    stats.cache_hits += 1
+                    cache.move_to_end(key)
+                    return result
+                stats.cache_misses += 1
+            result = func(*args, **kwargs)
+            with lock:
+                cache[key] = result
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return result
+        except RecursionError:
+            if outermost:
+                with lock:
+                    stats.recursion_errors += 1
+            raise
+        finally:
+            local.depth = depth - 1
+            if outermost:
+                elapsed = time.perf_counter() - start
+                with lock:
+                    stats.wall_time += elapsed
+
+    def cache_clear() -> None:
+        with lock:
+            cache.clear()
+
+    wrapper.stats = stats
+    wrapper.cache_clear = cache_clear
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def patch(owner: Any, attr: str, **options) -> CallStats:
+    """Replace owner.attr (a module function or class method) with an
+    instrumented version, so recursive calls through that name are counted.
+
+    Keyword options are passed to instrument(); the report name defaults to
+    "<owner>.<attr>". Returns the CallStats for the patched function.
+    """
+    original = getattr(owner, attr)
+    if hasattr(original, "stats"):
+        return original.stats
+    options.setdefault("name", f"{getattr(owner, '__name__', owner)}.{attr}")
+    wrapped = instrument(original, **options)
+    setattr(owner, attr, wrapped)
+    return wrapped.stats
+
+
+def unpatch(owner: Any, attr: str) -> None:
+    """Restore a function replaced by patch()."""
+    current = getattr(owner, attr)
+    if hasattr(current, "stats"):
+        setattr(owner, attr, current.__wrapped__)
+
+
+def load_script(path: str, module_name: Optional[str] = None):
+    """Import a .py file by path, e.g. "task.4.py" or "Assignment 11/L11 T4.py".
+
+    Those file names are not valid module names, so a plain import cannot
+    reach them. Relative paths are resolved against the repository root.
+    """
+    if not os.path.isabs(path):
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+    module_name = module_name or os.path.splitext(os.path.basename(path))[0].replace(" ", "_").replace(".", "_")
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def report(registry: Optional[Dict[str, CallStats]] = None) -> List[Dict[str, Any]]:
+    """Return the collected counters as a list of dicts, one per function."""
+    return [stats.as_dict() for stats in (REGISTRY if registry is None else registry).values()]
+
+
+def format_report(registry: Optional[Dict[str, CallStats]] = None) -> str:
+    """Return the collected counters as a plain-text table."""
+    header = f"{'function':<32}{'calls':>12}{'calls/inv':>12}{'max depth':>11}{'hit ratio':>11}{'wall s':>10}{'RecErr':>8}"
+    lines = [header, "-" * len(header)]
+    for row in report(registry):
+        ratio = "-" if row["cache_hit_ratio"] is None else f"{row['cache_hit_ratio']:.2%}"
+        lines.append(
+            f"{row['name']:<32}{row['calls']:>12}{row['calls_per_invocation']:>12.1f}"
+            f"{row['max_depth']:>11}{ratio:>11}{row['wall_time_s']:>10.4f}{row['recursion_errors']:>8}"
+        )
+    return "\n".join(lines)
+
+
+def export_json(path: str, registry: Optional[Dict[str, CallStats]] = None) -> None:
+    """Write report() to `path` as JSON."""
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report(registry), handle, indent=2)
+
+
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import sys
+
+    # Instrument every naive recursive helper in the repository and drive it
+    # with inputs that expose exponential blow-up or the recursion limit.
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "lab5"))
+    fib_module = load_script("lab5/fib_recursive.py")
+    task4 = load_script("task.4.py")
+    with contextlib.redirect_stdout(io.StringIO()):  # Task3 prints on import
+        task3 = load_script("Assignment 18/Task3.py")
+    bst_module = load_script("Assignment 11/L11 T4.py")
+
+    patch(fib_module, "fib")
+    fib_module.fib(22)
+    unpatch(fib_module, "fib")
+    patch(fib_module, "fib", name="fib (memo)", memo=True, maxsize=64)
+    fib_module.fib(22)
+
+    patch(task4, "factorial_recursive")
+    task4.factorial_recursive(300)
+    try:
+        task4.factorial_recursive(5000)
+    except RecursionError:
+        pass
+
+    patch(task3, "factorial")
+    task3.factorial(300, method=None)
+    patch(sys.modules["factorial_engine"], "_odd_range_product", name="engine._odd_range_product")
+    task3.factorial(5000)  # binary splitting: recursion depth O(log n)
+
+    for attr in ("_insert", "_search", "_delete"):
+        patch(bst_module.BST, attr)
+    tree = bst_module.BST()
+    for key in range(300):  # sorted keys: the tree degenerates into a list
+        tree.insert(key)
+    tree.search(299)
+    tree.delete(150)
+
+    print(format_report())
+    if len(sys.argv) > 1:
+        export_json(sys.argv[1])
+        print(f"Report written to {sys.argv[1]}")
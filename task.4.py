@@ -1,46 +1,78 @@
 
 from typing import Optional
 
+from bigint_format import write_int
+from factorial_engine import factorial as _engine_factorial
+
 
 # Recursive factorial
-def factorial_recursive(n: int) -> int:
+def factorial_recursive(n: int, method: Optional[str] = None) -> int:
 	"""Compute n! using recursion.
 
 	Raises ValueError for negative inputs.
 
 	Args:
 		n: Non-negative integer whose factorial is required.
+		method: None for the plain n * (n-1)! recursion (limited by the
+			recursion depth to n below ~1000), or one of the
+			factorial_engine methods: "split" (binary splitting, recursion
+			depth O(log n)), "swing" (prime swing) or "parallel" (process pool).
 
 	Returns:
 		The factorial of n as an int.
 	"""
 	if n < 0:
 		raise ValueError("factorial is not defined for negative integers")
+	if method is not None:
+		return _engine_factorial(n, method)
 	if n == 0 or n == 1:
 		return 1
 	return n * factorial_recursive(n - 1)
 
 
 # Iterative factorial
-def factorial_iterative(n: int) -> int:
+def factorial_iterative(n: int, method: Optional[str] = None) -> int:
 	"""Compute n! using an iterative loop.
 
 	Raises ValueError for negative inputs.
 
 	Args:
 		n: Non-negative integer whose factorial is required.
+		method: None for the running-product loop below (quadratic overall
+			for large n), or one of the factorial_engine methods: "split"
+			(binary-splitting product tree), "swing" (prime swing) or
+			"parallel" (sub-products on a process pool).
 
 	Returns:
 		The factorial of n as an int.
 	"""
 	if n < 0:
 		raise ValueError("factorial is not defined for negative integers")
+	if method is not None:
+		return _engine_factorial(n, method)
 	result = 1
 	for i in range(2, n + 1):
 		result *= i
 	return result
 
 
+def save_factorial(n: int, path: str, base: str = "dec") -> int:
+	"""Compute n! (binary splitting) and write it to `path` in decimal, hex or binary.
+
+	Rendering goes through bigint_format, which sidesteps CPython's quadratic
+	(and size-limited) int -> str conversion and writes in bounded chunks.
+
+	Args:
+		n: Non-negative integer whose factorial is required.
+		path: Destination file path.
+		base: One of "dec", "hex" or "bin".
+
+	Returns:
+		The number of characters written.
+	"""
+	return write_int(factorial_iterative(n, method="split"), path, base=base)
+
+
 if __name__ == "__main__":
 	# Quick checks for factorial implementations
 	cases = {
@@ -58,6 +90,12 @@ if __name__ == "__main__":
 		print(f"n={n}: recursive={r}, iterative={it}, expected={expected}")
 		assert r == expected, f"recursive failed for {n}: got {r}, expected {expected}"
 		assert it == expected, f"iterative failed for {n}: got {it}, expected {expected}"
+		for method in ("split", "swing"):
+			assert factorial_recursive(n, method) == expected, f"{method} failed for {n}"
+			assert factorial_iterative(n, method) == expected, f"{method} failed for {n}"
+
+	# The engine methods are not limited by the recursion depth
+	assert factorial_recursive(5000, "split") == factorial_iterative(5000)
 
 	# Check negative input raises
 	for func in (factorial_recursive, factorial_iterative):
@@ -1,21 +1,52 @@
-from typing import Any
+from math import gcd, isqrt
+from operator import index
+from typing import Iterable, List, Optional
 
+from prime_bitmap import PrimeBitmap
+from prime_sieve import primes_up_to
 
-def is_prime(n: int) -> bool:
-	"""Return True if n is a prime number, otherwise False.
+# Values below this are answered from a precomputed flag table.
+_SMALL_LIMIT = 1 << 16
+_SMALL_PRIMES = primes_up_to(_SMALL_LIMIT - 1)
+_SMALL_TABLE = bytearray(_SMALL_LIMIT)
+for _p in _SMALL_PRIMES:
+	_SMALL_TABLE[_p] = 1
 
-	Implementation details:
-	- Handles negative numbers, 0 and 1 (these are not prime).
-	- Checks small primes directly (2 and 3).
-	- Eliminates multiples of 2 and 3 early.
-	- Uses 6k +/- 1 optimization for trial division up to sqrt(n).
+# Product of the primes below 300: one gcd() rejects most composites at once.
+_PRIMORIAL = 1
+for _p in _SMALL_PRIMES:
+	if _p >= 300:
+		break
+	_PRIMORIAL *= _p
 
-	Args:
-		n: Integer to test for primality.
+# Optional memory-mapped bitmap installed by use_prime_bitmap(); values in
+# [_SMALL_LIMIT, _BITMAP_LIMIT) are answered from it in O(1).
+_BITMAP: Optional[PrimeBitmap] = None
+_BITMAP_LIMIT = 0
 
-	Returns:
-		True if `n` is prime, False otherwise.
+# Miller-Rabin with these bases is deterministic for every n < 3.3 * 10**24,
+# which covers all 64-bit integers.
+_MR_BASES_64 = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+
+def use_prime_bitmap(path: Optional[str]) -> None:
+	"""Answer is_prime() from a bitmap built by prime_bitmap.py (None to stop).
+
+	The file is memory-mapped, so this returns immediately and the bitmap's
+	pages are only read when lookups touch them. Values at or above the
+	bitmap's limit keep using the Miller-Rabin / Baillie-PSW paths.
 	"""
+	global _BITMAP, _BITMAP_LIMIT
+	if _BITMAP is not None:
+		_BITMAP.close()
+		_BITMAP, _BITMAP_LIMIT = None, 0
+	if path is not None:
+		_BITMAP = PrimeBitmap(path)
+		_BITMAP_LIMIT = _BITMAP.limit
+
+
+def _trial_division(n: int) -> bool:
+	"""The original 6k +/- 1 trial division, used for non-int inputs."""
 	if n <= 1:
 		return False
 	if n <= 3:
@@ -35,6 +66,153 @@ def is_prime(n: int) -> bool:
 	return True
 
 
+def _strong_probable_prime(n: int, base: int) -> bool:
+	"""Return True if odd n > 2 passes the Miller-Rabin test to `base`."""
+	d = n - 1
+	s = 0
+	while d % 2 == 0:
+		d //= 2
+		s += 1
+	x = pow(base, d, n)
+	if x == 1 or x == n - 1:
+		return True
+	for _ in range(s - 1):
+		x = x * x % n
+		if x == n - 1:
+			return True
+	return False
+
+
+def _jacobi(a: int, n: int) -> int:
+	"""Return the Jacobi symbol (a / n) for odd n > 0."""
+	a %= n
+	result = 1
+	while a:
+		while a % 2 == 0:
+			a //= 2
+			if n % 8 in (3, 5):
+				result = -result
+		a, n = n, a
+		if a % 4 == 3 and n % 4 == 3:
+			result = -result
+		a %= n
+	return result if n == 1 else 0
+
+
+def _strong_lucas_probable_prime(n: int) -> bool:
+	"""Strong Lucas test with Selfridge's parameters (odd n, not a square)."""
+	d_param = 5
+	while True:
+		j = _jacobi(d_param, n)
+		if j == -1:
+			break
+		if j == 0 and abs(d_param) != n:
+			return False
+		d_param = -d_param - 2 if d_param > 0 else -d_param + 2
+	p, q = 1, (1 - d_param) // 4
+
+	d = n + 1
+	s = 0
+	while d % 2 == 0:
+		d //= 2
+		s += 1
+
+	half = (n + 1) // 2  # inverse of 2 mod n
+	u, v, qk = 1, p, q % n  # U_1, V_1, Q^1
+	for bit in bin(d)[3:]:
+		u = u * v % n
+		v = (v * v - 2 * qk) % n
+		qk = qk * qk % n
+		if bit == "1":
+			u, v = (p * u + v) * half % n, (d_param * u + p * v) * half % n
+			qk = qk * q % n
+	if u == 0 or v == 0:
+		return True
+	for _ in range(s - 1):
+		v = (v * v - 2 * qk) % n
+		if v == 0:
+			return True
+		qk = qk * qk % n
+	return False
+
+
+def is_prime(n: int) -> bool:
+	"""Return True if n is a prime number, otherwise False.
+
+	Implementation details:
+	- Handles negative numbers, 0 and 1 (these are not prime).
+	- Answers n < 2**16 from a precomputed table, and n below the limit of
+	  a bitmap installed with use_prime_bitmap() from that bitmap.
+	- Rejects multiples of the primes below 300 with a single gcd().
+	- Uses deterministic Miller-Rabin (12 fixed bases) for n < 2**64.
+	- Uses Baillie-PSW (base-2 Miller-Rabin plus a strong Lucas test) for
+	  larger n; no counterexample to it is known.
+	- Converts integer-likes (e.g. NumPy integers) with operator.index()
+	  and falls back to 6k +/- 1 trial division only for non-integers.
+
+	Args:
+		n: Integer to test for primality.
+
+	Returns:
+		True if `n` is prime, False otherwise.
+	"""
+	if not isinstance(n, int):
+		try:
+			n = index(n)
+		except TypeError:
+			return _trial_division(n)
+	if n < _SMALL_LIMIT:
+		return n > 1 and _SMALL_TABLE[n] == 1
+	if n < _BITMAP_LIMIT:
+		return _BITMAP.is_prime(n)
+	if gcd(n, _PRIMORIAL) != 1:
+		return False
+	if n < 1 << 64:
+		return all(_strong_probable_prime(n, base) for base in _MR_BASES_64)
+	if not _strong_probable_prime(n, 2):
+		return False
+	if isqrt(n) ** 2 == n:
+		return False
+	return _strong_lucas_probable_prime(n)
+
+
+def is_prime_many(values: Iterable[int]) -> List[bool]:
+	"""Return [is_prime(n) for n in values], sharing setup across the batch.
+
+	The lookup table, primorial and base list are bound to locals once, and
+	the common cases (small n, n with a small factor) never leave this loop.
+	A NumPy integer array is converted to Python ints in one tolist() call;
+	other integer-likes go through operator.index() per element.
+	"""
+	dtype = getattr(values, "dtype", None)
+	if dtype is not None and dtype.kind in "iu":
+		values = values.tolist()
+	table, limit, primorial = _SMALL_TABLE, _SMALL_LIMIT, _PRIMORIAL
+	bitmap, bitmap_limit = _BITMAP, _BITMAP_LIMIT
+	bases, mr = _MR_BASES_64, _strong_probable_prime
+	word = 1 << 64
+	results = []
+	append = results.append
+	for n in values:
+		if type(n) is not int:
+			try:
+				n = index(n)
+			except TypeError:
+				append(_trial_division(n))
+				continue
+		if n < limit:
+			append(n > 1 and table[n] == 1)
+		elif n < bitmap_limit:
+			append(bitmap.is_prime(n))
+		elif gcd(n, primorial) != 1:
+			append(False)
+		elif n < word:
+			append(all(mr(n, base) for base in bases))
+		else:
+			append(is_prime(n))
+	return results
+
+
 if __name__ == "__main__":
 	# Quick self-checks (happy path + edge cases)
 	_tests = {
@@ -48,6 +226,14 @@ if __name__ == "__main__":
 		18: False,
 		19: True,
 		7919: True,  # known prime
+		65_537: True,  # first value past the lookup table
+		999_999_999_989: True,
+		1_000_000_007 * 998_244_353: False,
+		3_215_031_751: False,  # strong pseudoprime to bases 2, 3, 5, 7
+		18_446_744_073_709_551_557: True,  # largest 64-bit prime
+		2**89 - 1: True,  # Mersenne prime beyond 64 bits
+		(2**61 - 1) * (2**31 - 1): False,
+		3_825_123_056_546_413_051: False,  # strong pseudoprime to bases 2..23
 	}
 
 	for k, expected in _tests.items():
@@ -55,4 +241,31 @@ if __name__ == "__main__":
 		print(f"is_prime({k}) => {result} (expected {expected})")
 		assert result == expected, f"Failed for {k}: got {result}, expected {expected}"
 
+	assert is_prime_many(_tests) == list(_tests.values())
+	assert is_prime_many([7.0, 9.0]) == [True, False]  # floats still use trial division
+	try:
+		import numpy as np
+	except ImportError:
+		pass
+	else:
+		big = np.array([999_999_999_999_999_989, 999_999_999_999_999_991], dtype=np.int64)
+		assert is_prime_many(big) == [True, False] and is_prime(big[0])
+		assert is_prime_many(list(big)) == [True, False]
+	assert is_prime_many(range(-10, 20_000)) == [_trial_division(k) for k in range(-10, 20_000)]
+	big = range(10**12, 10**12 + 2_000)
+	assert is_prime_many(big) == [_trial_division(k) for k in big]
+
+	import os
+	import tempfile
+
+	from prime_bitmap import build
+
+	bitmap_path = os.path.join(tempfile.mkdtemp(), "primes.bmp")
+	build(bitmap_path, 2_000_000)
+	use_prime_bitmap(bitmap_path)
+	mixed = list(range(1_990_000, 2_010_000))
+	assert is_prime_many(mixed) == [_trial_division(k) for k in mixed]
+	use_prime_bitmap(None)
+	os.remove(bitmap_path)
+
 	print("All checks passed for is_prime().")